@@ -0,0 +1,21 @@
+"""
+JSON response class backed by orjson
+"""
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse as _ORJSONResponse
+
+
+class ORJSONResponse(_ORJSONResponse):
+    """orjson renderer that also accepts numpy values and non-string keys.
+
+    Datetimes are emitted as stored (naive ones without an offset), matching
+    what response_model endpoints return.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            default=str,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+        )
@@ -0,0 +1,28 @@
+"""
+Sparse field projection for list endpoints (?fields=a,b,c)
+"""
+from typing import Any, Dict, Iterable, List, Optional, Type
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel]) -> Optional[List[str]]:
+    """Validate a comma-separated field list against a response schema"""
+    if not fields:
+        return None
+    names = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return names or None
+
+
+def project(rows: Iterable[Any], names: List[str]) -> List[Dict[str, Any]]:
+    """Build plain dicts holding only the requested attributes/keys"""
+    return [
+        {name: (row.get(name) if isinstance(row, dict) else getattr(row, name)) for name in names}
+        for row in rows
+    ]
@@ -0,0 +1,15 @@
+"""
+Normalized user profile context passed to the AI service
+"""
+from typing import Any, Dict
+from app.models.user import User
+
+
+def user_context(user: User) -> Dict[str, Any]:
+    """Profile fields the AI prompts use, as a fresh dict callers may extend"""
+    return {
+        "user_id": user.id,
+        "age": user.age,
+        "income": user.income,
+        "risk_tolerance": user.risk_tolerance
+    }
@@ -4,11 +4,16 @@ Database Configuration and Session Management
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.core.config import settings
+from app.core.config import get_settings
+
+settings = get_settings()
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
+    pool_size=20,
+    max_overflow=10,
+    query_cache_size=1200,  # compiled SQL cache entries (SQLAlchemy default is 500)
     echo=settings.DEBUG
 )
 
@@ -1,11 +1,12 @@
 """
 Alert Model
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.database import Base
+from app.models.types import SmallIntEnum, JSONDocument
 
 class AlertType(str, enum.Enum):
     LOW_BALANCE = "low_balance"
@@ -24,17 +25,47 @@ class AlertPriority(str, enum.Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+
+# Stored SMALLINT codes; never change or reuse a code once rows exist
+ALERT_TYPE_CODES = {
+    AlertType.LOW_BALANCE: 0,
+    AlertType.MISSED_SIP: 1,
+    AlertType.GOAL_DEADLINE: 2,
+    AlertType.BUDGET_EXCEEDED: 3,
+    AlertType.OPPORTUNITY: 4,
+    AlertType.RISK_WARNING: 5,
+    AlertType.DUE_SOON: 6,
+    AlertType.PAST_DUE: 7,
+    AlertType.AUTO_PAY_FAIL: 8,
+}
+
+ALERT_PRIORITY_CODES = {
+    AlertPriority.LOW: 0,
+    AlertPriority.MEDIUM: 1,
+    AlertPriority.HIGH: 2,
+    AlertPriority.CRITICAL: 3,
+}
+
+
 class Alert(Base):
     __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_user_read_created", "user_id", "is_read", "created_at"),
+        Index("ix_alerts_user_type_entity", "user_id", "alert_type", "entity_id", "is_read"),
+        Index("ix_alerts_user_type_read_created", "user_id", "alert_type", "is_read", "created_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    alert_type = Column(Enum(AlertType), nullable=False)
+    alert_type = Column(SmallIntEnum(AlertType, ALERT_TYPE_CODES), nullable=False)
     title = Column(String, nullable=False)
     message = Column(String, nullable=False)
-    priority = Column(Enum(AlertPriority), default=AlertPriority.MEDIUM)
+    priority = Column(SmallIntEnum(AlertPriority, ALERT_PRIORITY_CODES), default=AlertPriority.MEDIUM)
     is_read = Column(Boolean, default=False)
-    alert_metadata = Column(String, nullable=True)  # JSON string
+    alert_metadata = Column(JSONDocument, nullable=True)
+    # Record the alert is about (e.g. "goal"/"obligation"), used for dedup lookups
+    entity_type = Column(String(32), nullable=True)
+    entity_id = Column(Integer, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # Relationships
@@ -1,11 +1,12 @@
 """
 Goal Model
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.database import Base
+from app.models.types import SmallIntEnum, JSONDocument
 
 class GoalStatus(str, enum.Enum):
     ACTIVE = "active"
@@ -21,20 +22,42 @@ class GoalType(str, enum.Enum):
     EMERGENCY = "emergency"
     OTHER = "other"
 
+
+# Stored SMALLINT codes; never change or reuse a code once rows exist
+GOAL_STATUS_CODES = {
+    GoalStatus.ACTIVE: 0,
+    GoalStatus.COMPLETED: 1,
+    GoalStatus.PAUSED: 2,
+    GoalStatus.CANCELLED: 3,
+}
+
+GOAL_TYPE_CODES = {
+    GoalType.RETIREMENT: 0,
+    GoalType.HOUSE: 1,
+    GoalType.EDUCATION: 2,
+    GoalType.VACATION: 3,
+    GoalType.EMERGENCY: 4,
+    GoalType.OTHER: 5,
+}
+
+
 class Goal(Base):
     __tablename__ = "goals"
+    __table_args__ = (
+        Index("ix_goals_user_status", "user_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    goal_type = Column(Enum(GoalType), nullable=False)
+    goal_type = Column(SmallIntEnum(GoalType, GOAL_TYPE_CODES), nullable=False)
     target_amount = Column(Float, nullable=False)
     current_amount = Column(Float, default=0.0)
     target_date = Column(DateTime(timezone=True), nullable=False)
     monthly_contribution = Column(Float, nullable=True)
-    status = Column(Enum(GoalStatus), default=GoalStatus.ACTIVE)
-    ai_plan = Column(String, nullable=True)  # JSON string with AI-generated plan
+    status = Column(SmallIntEnum(GoalStatus, GOAL_STATUS_CODES), default=GoalStatus.ACTIVE)
+    ai_plan = Column(JSONDocument, nullable=True)  # AI-generated plan
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -1,11 +1,12 @@
 """
 Obligation Model for recurring payments (bills, EMIs, SIPs, insurance)
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
 from app.database import Base
+from app.models.types import SmallIntEnum, JSONDocument
 
 
 class ObligationType(str, enum.Enum):
@@ -31,21 +32,49 @@ class ObligationStatus(str, enum.Enum):
     CLOSED = "closed"
 
 
+# Stored SMALLINT codes; never change or reuse a code once rows exist
+OBLIGATION_TYPE_CODES = {
+    ObligationType.CREDIT_CARD_BILL: 0,
+    ObligationType.EMI: 1,
+    ObligationType.SIP: 2,
+    ObligationType.INSURANCE: 3,
+    ObligationType.UTILITY: 4,
+    ObligationType.OTHER: 5,
+}
+
+OBLIGATION_FREQUENCY_CODES = {
+    ObligationFrequency.MONTHLY: 0,
+    ObligationFrequency.QUARTERLY: 1,
+    ObligationFrequency.YEARLY: 2,
+    ObligationFrequency.WEEKLY: 3,
+    ObligationFrequency.ONE_TIME: 4,
+}
+
+OBLIGATION_STATUS_CODES = {
+    ObligationStatus.ACTIVE: 0,
+    ObligationStatus.PAUSED: 1,
+    ObligationStatus.CLOSED: 2,
+}
+
+
 class Obligation(Base):
     __tablename__ = "obligations"
+    __table_args__ = (
+        Index("ix_obligations_user_status", "user_id", "status"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     title = Column(String, nullable=False)
-    obligation_type = Column(Enum(ObligationType), nullable=False, default=ObligationType.OTHER)
+    obligation_type = Column(SmallIntEnum(ObligationType, OBLIGATION_TYPE_CODES), nullable=False, default=ObligationType.OTHER)
     amount = Column(Float, nullable=False)
     provider = Column(String, nullable=True)
     due_date = Column(DateTime(timezone=True), nullable=False)
     next_due_date = Column(DateTime(timezone=True), nullable=True)
-    frequency = Column(Enum(ObligationFrequency), nullable=False, default=ObligationFrequency.MONTHLY)
+    frequency = Column(SmallIntEnum(ObligationFrequency, OBLIGATION_FREQUENCY_CODES), nullable=False, default=ObligationFrequency.MONTHLY)
     autopay_enabled = Column(Boolean, default=False)
-    status = Column(Enum(ObligationStatus), default=ObligationStatus.ACTIVE)
-    extra_metadata = Column(String, nullable=True)
+    status = Column(SmallIntEnum(ObligationStatus, OBLIGATION_STATUS_CODES), default=ObligationStatus.ACTIVE)
+    extra_metadata = Column(JSONDocument, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
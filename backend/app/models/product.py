@@ -1,10 +1,11 @@
 """
 Financial Product Model
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text
 from sqlalchemy.sql import func
 import enum
 from app.database import Base
+from app.models.types import SmallIntEnum, JSONDocument
 
 class ProductType(str, enum.Enum):
     MUTUAL_FUND = "mutual_fund"
@@ -23,20 +24,44 @@ class RiskLevel(str, enum.Enum):
     MEDIUM = "medium"
     HIGH = "high"
 
+
+# Stored SMALLINT codes; never change or reuse a code once rows exist
+PRODUCT_TYPE_CODES = {
+    ProductType.MUTUAL_FUND: 0,
+    ProductType.SIP: 1,
+    ProductType.FD: 2,
+    ProductType.RD: 3,
+    ProductType.STOCK: 4,
+    ProductType.BOND: 5,
+    ProductType.INSURANCE: 6,
+    ProductType.PPF: 7,
+    ProductType.CREDIT_CARD: 8,
+    ProductType.OTHER: 9,
+}
+
+RISK_LEVEL_CODES = {
+    RiskLevel.LOW: 0,
+    RiskLevel.MEDIUM: 1,
+    RiskLevel.HIGH: 2,
+}
+
+# Ordinal of each risk level; the stored codes are already in risk order
+RISK_ORDINALS = RISK_LEVEL_CODES
+
 class Product(Base):
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    product_type = Column(Enum(ProductType), nullable=False)
+    product_type = Column(SmallIntEnum(ProductType, PRODUCT_TYPE_CODES), nullable=False)
     description = Column(Text, nullable=True)
     provider = Column(String, nullable=True)
-    risk_level = Column(Enum(RiskLevel), nullable=False)
+    risk_level = Column(SmallIntEnum(RiskLevel, RISK_LEVEL_CODES), nullable=False)
     min_investment = Column(Float, nullable=True)
     expected_return = Column(Float, nullable=True)  # Annual percentage
     lock_in_period = Column(Integer, nullable=True)  # In months
-    features = Column(Text, nullable=True)  # JSON string
-    eligibility_criteria = Column(Text, nullable=True)  # JSON string
+    features = Column(JSONDocument, nullable=True)
+    eligibility_criteria = Column(JSONDocument, nullable=True)
     # Credit card specific fields (optional)
     issuer = Column(String, nullable=True)
     annual_fee = Column(Float, nullable=True)
@@ -1,11 +1,12 @@
 """
 Transaction Model
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from app.database import Base
+from app.models.types import SmallIntEnum
 
 class TransactionType(str, enum.Enum):
     INCOME = "income"
@@ -25,14 +26,41 @@ class TransactionCategory(str, enum.Enum):
     INVESTMENT = "investment"
     OTHER = "other"
 
+
+# Stored SMALLINT codes; never change or reuse a code once rows exist
+TRANSACTION_TYPE_CODES = {
+    TransactionType.INCOME: 0,
+    TransactionType.EXPENSE: 1,
+    TransactionType.INVESTMENT: 2,
+    TransactionType.TRANSFER: 3,
+}
+
+TRANSACTION_CATEGORY_CODES = {
+    TransactionCategory.FOOD: 0,
+    TransactionCategory.TRANSPORT: 1,
+    TransactionCategory.ENTERTAINMENT: 2,
+    TransactionCategory.BILLS: 3,
+    TransactionCategory.SHOPPING: 4,
+    TransactionCategory.HEALTHCARE: 5,
+    TransactionCategory.EDUCATION: 6,
+    TransactionCategory.SALARY: 7,
+    TransactionCategory.INVESTMENT: 8,
+    TransactionCategory.OTHER: 9,
+}
+
+
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_user_date", "user_id", "date"),
+        Index("ix_transactions_user_type_date", "user_id", "transaction_type", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     amount = Column(Float, nullable=False)
-    transaction_type = Column(Enum(TransactionType), nullable=False)
-    category = Column(Enum(TransactionCategory), nullable=False)
+    transaction_type = Column(SmallIntEnum(TransactionType, TRANSACTION_TYPE_CODES), nullable=False)
+    category = Column(SmallIntEnum(TransactionCategory, TRANSACTION_CATEGORY_CODES), nullable=False)
     description = Column(String, nullable=True)
     merchant = Column(String, nullable=True)
     date = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
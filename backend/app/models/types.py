@@ -0,0 +1,41 @@
+"""
+Custom column types shared by the models
+"""
+from sqlalchemy import JSON, SmallInteger
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.types import TypeDecorator
+
+# Native JSONB on Postgres, generic JSON elsewhere (e.g. SQLite in development)
+JSONDocument = JSON().with_variant(JSONB(), "postgresql")
+
+
+class SmallIntEnum(TypeDecorator):
+    """Store a Python enum in a SMALLINT column using an explicit member -> code map.
+
+    The codes are the stored contract: reordering enum members is harmless, but a
+    code must never be reused or changed once rows exist. Every member needs a code,
+    so adding one without extending the map fails at import time.
+    """
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_cls, codes, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        missing = [member.name for member in enum_cls if member not in codes]
+        if missing:
+            raise ValueError(f"{enum_cls.__name__} has no stored code for: {', '.join(missing)}")
+        if len(set(codes.values())) != len(codes):
+            raise ValueError(f"{enum_cls.__name__} stored codes must be unique")
+        self.enum_cls = enum_cls
+        self._codes = dict(codes)
+        self._members = {code: member for member, code in codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        return self._codes[self.enum_cls(value)]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._members[value]
@@ -22,7 +22,7 @@ class User(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan")
+    goals = relationship("Goal", back_populates="user", cascade="all, delete-orphan", lazy="selectin")
     transactions = relationship("Transaction", back_populates="user", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
     obligations = relationship("Obligation", back_populates="user", cascade="all, delete-orphan")
@@ -6,39 +6,46 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.models.user import User
-from app.schemas.alert import AlertResponse
-from app.services.alert_service import AlertService
+from app.schemas.alert import AlertResponse, AlertGenerationResponse
+from app.services.alert_service import AlertService, get_alert_service
 from app.core.security import get_current_user
+from app.core.orjson_response import ORJSONResponse
+from app.core.projection import parse_fields
 
 router = APIRouter()
-alert_service = AlertService()
 
 @router.get("", response_model=List[AlertResponse])
 async def get_alerts(
     is_read: Optional[bool] = Query(None),
     limit: int = Query(50, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return"),
+    alert_service: AlertService = Depends(get_alert_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get alerts for the current user"""
-    alerts = alert_service.get_alerts(db, current_user.id, is_read, limit)
-    return alerts
+    names = parse_fields(fields, AlertResponse)
+    alerts = alert_service.get_alerts(db, current_user.id, is_read, limit, fields=names)
+    return ORJSONResponse(AlertResponse.dump_many(alerts, names))
 
-@router.post("/generate")
-async def generate_alerts(
+@router.post("/generate", response_model=AlertGenerationResponse)
+def generate_alerts(
+    alert_service: AlertService = Depends(get_alert_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Generate all predictive alerts for the current user"""
+    # Plain def: FastAPI runs this DB-only sweep in its threadpool instead of the event loop
     alerts = alert_service.generate_all_alerts(db, current_user.id)
     return {
         "message": f"Generated {len(alerts)} alerts",
-        "alerts": [AlertResponse.model_validate(a).model_dump() for a in alerts]
+        "alerts": alerts
     }
 
 @router.post("/{alert_id}/read", status_code=200)
 async def mark_alert_read(
     alert_id: int,
+    alert_service: AlertService = Depends(get_alert_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
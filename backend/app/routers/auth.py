@@ -14,7 +14,7 @@ from app.core.security import (
     get_current_user
 )
 from datetime import timedelta
-from app.core.config import settings
+from app.core.config import Settings, get_settings
 
 router = APIRouter()
 security = HTTPBearer()
@@ -54,7 +54,11 @@ async def register(user: UserCreate, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/login")
-async def login(user: UserCreate, db: Session = Depends(get_db)):
+async def login(
+    user: UserCreate,
+    db: Session = Depends(get_db),
+    settings: Settings = Depends(get_settings)
+):
     """Login and get access token"""
     db_user = db.query(User).filter(User.email == user.email).first()
     if not db_user or not verify_password(user.password, db_user.hashed_password):
@@ -8,11 +8,11 @@ from datetime import datetime
 from app.database import get_db
 from app.models.user import User
 from app.schemas.transaction import TransactionCreate, TransactionResponse
-from app.services.budget_service import BudgetService
+from app.services.budget_service import BudgetService, get_budget_service
 from app.core.security import get_current_user
+from app.core.orjson_response import ORJSONResponse
 
 router = APIRouter()
-budget_service = BudgetService()
 
 @router.post("/transactions", response_model=TransactionResponse, status_code=201)
 async def create_transaction(
@@ -33,6 +33,7 @@ async def create_transaction(
 async def get_budget_insights(
     month: Optional[int] = Query(None, ge=1, le=12),
     year: Optional[int] = Query(None, ge=2000),
+    budget_service: BudgetService = Depends(get_budget_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -46,6 +47,7 @@ async def get_budget_insights(
 async def get_transactions(
     skip: int = 0,
     limit: int = 100,
+    budget_service: BudgetService = Depends(get_budget_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -53,5 +55,5 @@ async def get_transactions(
     transactions = budget_service.get_transactions(
         db, current_user.id, limit=limit
     )
-    return transactions
+    return ORJSONResponse(TransactionResponse.dump_many(transactions))
 
@@ -2,110 +2,102 @@
 Chat Router for conversational interface
 """
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 from app.database import get_db
 from app.models.user import User
-from app.schemas.chat import ChatMessage, ChatResponse
-from app.services.ai_service import AIService
+from app.schemas.chat import ChatMessage, ChatResponse, ChatTurn
+from app.services.ai_service import AIService, get_ai_service
 from app.core.security import get_current_user
+from app.core.user_context import user_context
 from app.models.conversation import Conversation, Message
 
 router = APIRouter()
-ai_service = AIService()
 
 @router.post("", response_model=ChatResponse)
 async def chat(
     message: ChatMessage,
+    ai_service: AIService = Depends(get_ai_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Chat with the AI financial assistant"""
     # Build user context
-    context = {
-        "user_id": current_user.id,
-        "age": current_user.age,
-        "income": current_user.income,
-        "risk_tolerance": current_user.risk_tolerance
-    }
+    context = user_context(current_user)
     
-    # Get user goals for context
-    from app.models.goal import Goal
-    goals = db.query(Goal).filter(Goal.user_id == current_user.id).limit(5).all()
+    # User goals are selectin-loaded alongside the user
     context["goals"] = [
         {"title": g.title, "target_amount": g.target_amount, "current_amount": g.current_amount}
-        for g in goals
+        for g in current_user.goals[:5]
     ]
     
     # Merge with provided context
     if message.context:
         context.update(message.context)
     
-    conversation: Conversation
-    if message.conversation_id:
-        conversation = db.query(Conversation).filter(
-            Conversation.id == message.conversation_id,
-            Conversation.user_id == current_user.id
-        ).first()
+    user_id = current_user.id
+    conversation_id = message.conversation_id
+    if conversation_id:
+        conversation = db.execute(
+            select(Conversation)
+            .options(selectinload(Conversation.messages))
+            .where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user_id
+            )
+        ).scalar_one_or_none()
         if not conversation:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found")
+        history_messages = list(conversation.messages)
     else:
-        conversation = Conversation(
-            user_id=current_user.id,
-            title=message.message[:80]
-        )
-        db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        history_messages = []
 
-    # Load history
-    history_messages = db.query(Message).filter(
-        Message.conversation_id == conversation.id
-    ).order_by(Message.created_at.asc()).all()
     history_payload = [
         {"role": m.role, "content": m.content} for m in history_messages
     ]
+    prior_turns = [ChatTurn.model_validate(m) for m in history_messages]
 
-    # Persist user message
-    user_msg = Message(
-        conversation_id=conversation.id,
-        role="user",
-        content=message.message
-    )
-    db.add(user_msg)
-    db.commit()
+    # End the read transaction so no pooled connection is held during the LLM call
+    db.rollback()
 
     # Get AI response
     response = await ai_service.chat_response(message.message, context, history_payload)
 
+    # Persist both turns, and any new conversation, in one transaction
+    user_msg = Message(role="user", content=message.message)
     assistant_msg = Message(
-        conversation_id=conversation.id,
         role="assistant",
         content=response["response"],
         reasoning=response.get("reasoning")
     )
-    db.add(assistant_msg)
-    db.commit()
+    if conversation_id:
+        user_msg.conversation_id = conversation_id
+        assistant_msg.conversation_id = conversation_id
+        db.add_all([user_msg, assistant_msg])
+    else:
+        conversation = Conversation(
+            user_id=user_id,
+            title=message.message[:80],
+            messages=[user_msg, assistant_msg]
+        )
+        db.add(conversation)
+    db.flush()
 
-    # Reload history for response
-    latest_history = db.query(Message).filter(
-        Message.conversation_id == conversation.id
-    ).order_by(Message.created_at.asc()).all()
+    # Build history in memory before commit expires the new rows
+    latest_history = [
+        *prior_turns,
+        ChatTurn.model_validate(user_msg),
+        ChatTurn.model_validate(assistant_msg)
+    ]
+    conversation_id = user_msg.conversation_id
+    db.commit()
 
     return ChatResponse(
         response=response["response"],
         reasoning=response.get("reasoning"),
         suggestions=response.get("suggestions"),
         confidence=response.get("confidence"),
-        conversation_id=conversation.id,
-        history=[
-            {
-                "id": m.id,
-                "role": m.role,
-                "content": m.content,
-                "reasoning": m.reasoning,
-                "created_at": m.created_at
-            }
-            for m in latest_history
-        ]
+        conversation_id=conversation_id,
+        history=latest_history
     )
 
@@ -1,48 +1,49 @@
 """
 Goals Router
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.database import get_db
 from app.models.user import User
-from app.schemas.goal import GoalCreate, GoalResponse, GoalUpdate
-from app.services.goal_service import GoalService
+from app.schemas.goal import GoalCreate, GoalResponse, GoalDetailResponse, GoalUpdate
+from app.services.goal_service import GoalService, get_goal_service
 from app.core.security import get_current_user
+from app.core.orjson_response import ORJSONResponse
+from app.core.projection import parse_fields
+from app.core.user_context import user_context
 
 router = APIRouter()
-goal_service = GoalService()
 
-@router.post("", response_model=GoalResponse, status_code=status.HTTP_201_CREATED)
+@router.post("", response_model=GoalDetailResponse, status_code=status.HTTP_201_CREATED)
 async def create_goal(
     goal: GoalCreate,
+    goal_service: GoalService = Depends(get_goal_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new financial goal with AI-generated plan"""
-    user_context = {
-        "age": current_user.age,
-        "income": current_user.income,
-        "risk_tolerance": current_user.risk_tolerance
-    }
-    
-    db_goal = await goal_service.create_goal(db, goal, current_user.id, user_context)
+    db_goal = await goal_service.create_goal(db, goal, current_user.id, user_context(current_user))
     return db_goal
 
 @router.get("", response_model=List[GoalResponse])
 async def get_goals(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return"),
+    goal_service: GoalService = Depends(get_goal_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all goals for the current user"""
-    goals = goal_service.get_goals(db, current_user.id, skip, limit)
-    return goals
+    names = parse_fields(fields, GoalResponse)
+    goals = goal_service.get_goals(db, current_user.id, skip, limit, fields=names)
+    return ORJSONResponse(GoalResponse.dump_many(goals, names))
 
-@router.get("/{goal_id}", response_model=GoalResponse)
+@router.get("/{goal_id}", response_model=GoalDetailResponse)
 async def get_goal(
     goal_id: int,
+    goal_service: GoalService = Depends(get_goal_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -55,10 +56,11 @@ async def get_goal(
         )
     return goal
 
-@router.put("/{goal_id}", response_model=GoalResponse)
+@router.put("/{goal_id}", response_model=GoalDetailResponse)
 async def update_goal(
     goal_id: int,
     goal_update: GoalUpdate,
+    goal_service: GoalService = Depends(get_goal_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -74,6 +76,7 @@ async def update_goal(
 @router.delete("/{goal_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_goal(
     goal_id: int,
+    goal_service: GoalService = Depends(get_goal_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
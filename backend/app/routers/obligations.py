@@ -7,16 +7,17 @@ from typing import List
 from app.database import get_db
 from app.models.user import User
 from app.schemas.obligation import ObligationCreate, ObligationResponse
-from app.services.obligation_service import ObligationService
+from app.services.obligation_service import ObligationService, get_obligation_service
 from app.core.security import get_current_user
+from app.core.orjson_response import ORJSONResponse
 
 router = APIRouter()
-obligation_service = ObligationService()
 
 
 @router.post("", response_model=ObligationResponse, status_code=status.HTTP_201_CREATED)
 async def create_obligation(
     obligation: ObligationCreate,
+    obligation_service: ObligationService = Depends(get_obligation_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -25,15 +26,18 @@ async def create_obligation(
 
 @router.get("", response_model=List[ObligationResponse])
 async def list_obligations(
+    obligation_service: ObligationService = Depends(get_obligation_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    return obligation_service.list_obligations(db, current_user.id)
+    obligations = obligation_service.list_obligations(db, current_user.id)
+    return ORJSONResponse(ObligationResponse.dump_many(obligations))
 
 
 @router.delete("/{obligation_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_obligation(
     obligation_id: int,
+    obligation_service: ObligationService = Depends(get_obligation_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
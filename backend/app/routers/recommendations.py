@@ -6,17 +6,21 @@ from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.database import get_db
 from app.models.user import User
-from app.schemas.product import ProductRecommendation
-from app.services.recommendation_service import RecommendationService
+from app.schemas.product import ProductRecommendation, ProductResponse
+from app.services.recommendation_service import (
+    RecommendationService, get_recommendation_service, get_products_page, store_products_page
+)
 from app.core.security import get_current_user
+from app.core.orjson_response import ORJSONResponse
+from app.core.projection import parse_fields, project
 
 router = APIRouter()
-recommendation_service = RecommendationService()
 
 @router.get("", response_model=List[ProductRecommendation])
 async def get_recommendations(
     goal_id: Optional[int] = Query(None),
     limit: int = Query(5, ge=1, le=20),
+    recommendation_service: RecommendationService = Depends(get_recommendation_service),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -26,16 +30,29 @@ async def get_recommendations(
     )
     return recommendations
 
-@router.get("/products", response_model=List[dict])
+@router.get("/products", response_model=List[ProductResponse])
 async def get_all_products(
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description="Comma-separated subset of fields to return"),
     db: Session = Depends(get_db)
 ):
     """Get all available financial products"""
     from app.models.product import Product
-    from app.schemas.product import ProductResponse
     
-    products = db.query(Product).offset(skip).limit(limit).all()
-    return [ProductResponse.model_validate(p).model_dump() for p in products]
+    names = parse_fields(fields, ProductResponse)
+    key = (skip, limit)
+    payload, generation = get_products_page(key)
+    cache_status = "HIT"
+    if payload is None:
+        products = db.query(Product).offset(skip).limit(limit).all()
+        payload = ProductResponse.dump_many(products)
+        if payload:
+            # Empty pages are not cached so newly added products show up immediately
+            store_products_page(key, payload, generation)
+        cache_status = "MISS"
+
+    if names:
+        payload = project(payload, names)
+    return ORJSONResponse(payload, headers={"X-Cache": cache_status})
 
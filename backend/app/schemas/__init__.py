@@ -1,16 +1,16 @@
 from .user import UserCreate, UserResponse, UserUpdate
-from .goal import GoalCreate, GoalResponse, GoalUpdate
+from .goal import GoalCreate, GoalResponse, GoalDetailResponse, GoalUpdate
 from .transaction import TransactionCreate, TransactionResponse
 from .product import ProductResponse, ProductRecommendation
-from .alert import AlertResponse, AlertCreate
+from .alert import AlertResponse, AlertCreate, AlertGenerationResponse
 from .chat import ChatMessage, ChatResponse
 
 __all__ = [
     "UserCreate", "UserResponse", "UserUpdate",
-    "GoalCreate", "GoalResponse", "GoalUpdate",
+    "GoalCreate", "GoalResponse", "GoalDetailResponse", "GoalUpdate",
     "TransactionCreate", "TransactionResponse",
     "ProductResponse", "ProductRecommendation",
-    "AlertResponse", "AlertCreate",
+    "AlertResponse", "AlertCreate", "AlertGenerationResponse",
     "ChatMessage", "ChatResponse"
 ]
 
@@ -1,19 +1,20 @@
 """
 Alert Schemas
 """
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
 from datetime import datetime
 from app.models.alert import AlertType, AlertPriority
+from app.schemas.base import FastFromORM
 
 class AlertCreate(BaseModel):
     alert_type: AlertType
     title: str
     message: str
     priority: AlertPriority = AlertPriority.MEDIUM
-    alert_metadata: Optional[str] = None
+    alert_metadata: Optional[dict] = None
 
-class AlertResponse(BaseModel):
+class AlertResponse(FastFromORM, BaseModel):
     id: int
     user_id: int
     alert_type: AlertType
@@ -21,9 +22,11 @@ class AlertResponse(BaseModel):
     message: str
     priority: AlertPriority
     is_read: bool
-    alert_metadata: Optional[str] = None
+    alert_metadata: Optional[dict] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, extra="ignore")
 
+class AlertGenerationResponse(BaseModel):
+    message: str
+    alerts: List[AlertResponse]
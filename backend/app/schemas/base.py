@@ -0,0 +1,34 @@
+"""
+Shared schema helpers
+"""
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class FastFromORM:
+    """Trusted ORM -> response conversion that skips pydantic validation.
+
+    Only mix into response schemas without validators; request schemas must
+    keep validating client input.
+    """
+
+    @classmethod
+    def from_orm_fast(cls, obj: Any, fields: Optional[List[str]] = None):
+        """Build without validation, reading only the given fields when a subset is requested"""
+        return cls.model_construct(**{
+            name: getattr(obj, cls.model_fields[name].validation_alias or name, None)
+            for name in (fields or cls.model_fields)
+        })
+
+    @classmethod
+    def dump_many(cls, objs: Iterable[Any], fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """JSON-ready list payload, optionally limited to ``fields``.
+
+        Uses pydantic's JSON mode so datetimes and enums render exactly as in
+        response_model endpoints (e.g. UTC as ``Z``). Null fields stay in the
+        payload as ``null``, so list, projected and detail rows share one shape.
+        """
+        include = set(fields) if fields else None
+        return [
+            cls.from_orm_fast(obj, fields).model_dump(mode="json", include=include)
+            for obj in objs
+        ]
@@ -1,10 +1,11 @@
 """
 Goal Schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from app.models.goal import GoalStatus, GoalType
+from app.schemas.base import FastFromORM
 
 class GoalBase(BaseModel):
     title: str
@@ -25,15 +26,17 @@ class GoalUpdate(BaseModel):
     monthly_contribution: Optional[float] = None
     status: Optional[GoalStatus] = None
 
-class GoalResponse(GoalBase):
+class GoalResponse(FastFromORM, GoalBase):
     id: int
     user_id: int
     current_amount: float
     status: GoalStatus
-    ai_plan: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, extra="ignore")
+
+class GoalDetailResponse(GoalResponse):
+    """Single-goal payload, including the AI-generated plan"""
+    ai_plan: Optional[dict] = None
 
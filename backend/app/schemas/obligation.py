@@ -1,10 +1,11 @@
 """
 Obligation Schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 from app.models.obligation import ObligationType, ObligationFrequency, ObligationStatus
+from app.schemas.base import FastFromORM
 
 
 class ObligationCreate(BaseModel):
@@ -17,10 +18,10 @@ class ObligationCreate(BaseModel):
     frequency: ObligationFrequency = ObligationFrequency.MONTHLY
     autopay_enabled: bool = False
     status: ObligationStatus = ObligationStatus.ACTIVE
-    metadata: Optional[str] = None
+    metadata: Optional[dict] = None
 
 
-class ObligationResponse(BaseModel):
+class ObligationResponse(FastFromORM, BaseModel):
     id: int
     user_id: int
     title: str
@@ -32,9 +33,9 @@ class ObligationResponse(BaseModel):
     frequency: ObligationFrequency
     autopay_enabled: bool
     status: ObligationStatus
-    metadata: Optional[str] = None
+    # Stored as extra_metadata; `metadata` is reserved on declarative models
+    metadata: Optional[dict] = Field(default=None, validation_alias="extra_metadata")
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, extra="ignore")
 
@@ -1,12 +1,13 @@
 """
 Product Schemas
 """
-from pydantic import BaseModel
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Union
 from datetime import datetime
 from app.models.product import ProductType, RiskLevel
+from app.schemas.base import FastFromORM
 
-class ProductResponse(BaseModel):
+class ProductResponse(FastFromORM, BaseModel):
     id: int
     name: str
     product_type: ProductType
@@ -16,8 +17,8 @@ class ProductResponse(BaseModel):
     min_investment: Optional[float] = None
     expected_return: Optional[float] = None
     lock_in_period: Optional[int] = None
-    features: Optional[str] = None
-    eligibility_criteria: Optional[str] = None
+    features: Optional[Union[dict, list]] = None
+    eligibility_criteria: Optional[Union[dict, list]] = None
     issuer: Optional[str] = None
     annual_fee: Optional[float] = None
     rewards_type: Optional[str] = None
@@ -25,8 +26,7 @@ class ProductResponse(BaseModel):
     intro_apr_months: Optional[int] = None
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, extra="ignore")
 
 class ProductRecommendation(BaseModel):
     product: ProductResponse
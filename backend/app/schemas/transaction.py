@@ -1,10 +1,11 @@
 """
 Transaction Schemas
 """
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional
 from datetime import datetime
 from app.models.transaction import TransactionType, TransactionCategory
+from app.schemas.base import FastFromORM
 
 class TransactionBase(BaseModel):
     amount: float
@@ -17,11 +18,10 @@ class TransactionBase(BaseModel):
 class TransactionCreate(TransactionBase):
     pass
 
-class TransactionResponse(TransactionBase):
+class TransactionResponse(FastFromORM, TransactionBase):
     id: int
     user_id: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, use_enum_values=True, extra="ignore")
 
@@ -1,9 +1,10 @@
 """
 User Schemas
 """
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from typing import Optional
 from datetime import datetime
+from app.schemas.base import FastFromORM
 
 class UserBase(BaseModel):
     email: EmailStr
@@ -23,11 +24,10 @@ class UserUpdate(BaseModel):
     income: Optional[float] = None
     risk_tolerance: Optional[str] = None
 
-class UserResponse(UserBase):
+class UserResponse(FastFromORM, UserBase):
     id: int
     is_active: bool
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
@@ -2,64 +2,296 @@
 AI Service using LangChain and OpenAI
 """
 from typing import Dict, List, Optional
+import asyncio
+from functools import cached_property, lru_cache
+from datetime import datetime
 from langchain_openai import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain_core.messages import HumanMessage, SystemMessage
-import json
-from app.core.config import settings
+from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain.globals import set_llm_cache
+from langchain_core.caches import BaseCache
+import orjson
+import tiktoken
+from cachetools import TTLCache
+from app.core.config import get_settings
+
+class _BoundedLLMCache(BaseCache):
+    """LLM response cache with a size limit and expiry, unlike langchain's InMemoryCache"""
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 3600):
+        self._cache: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def lookup(self, prompt: str, llm_string: str):
+        return self._cache.get((prompt, llm_string))
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        self._cache[(prompt, llm_string)] = return_val
+
+    def clear(self, **kwargs) -> None:
+        self._cache.clear()
+
+
+# Identical prompts (same model params) are answered from memory without an API call.
+# Only models built with cache=True use it; see AIService.deterministic_llm.
+set_llm_cache(_BoundedLLMCache())
+
+
+# Static system prompts. They open every message list unchanged so providers with
+# automatic prefix caching can reuse them; never format per-request data into them.
+SYSTEM_GOAL = """You are a financial planning assistant. 
+            Extract financial goals from user input and create a structured plan.
+            Return a JSON object with: title, description, goal_type, target_amount, target_date, monthly_contribution, reasoning.
+            Consider user's income, age, and risk tolerance when creating the plan."""
+
+SYSTEM_SPEND = """You are a financial behavior analyst.
+            Analyze spending patterns and provide actionable savings suggestions.
+            You will receive one or more transaction windows. For each, return an object with:
+            id, insights, categories_analysis, savings_opportunities, recommendations.
+            Reply with a JSON array."""
+
+SYSTEM_REC = """You are a financial advisor providing explainable recommendations.
+            Explain why a product is suitable for the user in clear, understandable terms."""
+
+SYSTEM_REC_BATCH = """You are a financial advisor providing explainable recommendations.
+            Explain why each product is suitable for the user in clear, understandable terms.
+            You will receive several products. For each, return an object with: id, reasoning.
+            Reply with a JSON array."""
+
+SYSTEM_CHAT = """You are a helpful financial assistant.
+            Provide clear, actionable financial advice. Always explain your reasoning.
+            Be empathetic and supportive. Keep answers concise and numbered when listing steps."""
+
+
+# Prompt-token budget for the transaction data of one spending analysis call
+SPEND_TOKEN_BUDGET = 3000
+
+# Recommendation reasoning per (product, profile bucket); users in the same bucket share it
+_reasoning_cache: TTLCache = TTLCache(maxsize=4096, ttl=300)
+
+
+def _dumps(obj) -> str:
+    """Serialize prompt payloads with sorted keys so identical inputs give identical prompts"""
+    return orjson.dumps(obj, option=orjson.OPT_NAIVE_UTC | orjson.OPT_SORT_KEYS).decode()
+
+
+def _profile_bucket(user_profile: Dict) -> Dict:
+    """Coarse profile (age decade, income band of 10k) used for reasoning prompts and their cache key.
+
+    The prompt only sees the bucket, so a cached answer never quotes another user's exact figures.
+    """
+    age = user_profile.get("age")
+    income = user_profile.get("income")
+    return {
+        "risk_tolerance": user_profile.get("risk_tolerance") or "moderate",
+        "age_range": f"{age // 10 * 10}-{age // 10 * 10 + 9}" if age else None,
+        "income_range": f"{int(income // 10000) * 10000}-{int(income // 10000) * 10000 + 9999}" if income else None
+    }
+
+
+def _loads_json(content: str):
+    """Parse a JSON reply, tolerating a surrounding ```json code fence; None if it is not JSON"""
+    text = content.strip()
+    if text.startswith("```"):
+        text = text.split("\n", 1)[1] if "\n" in text else ""
+        text = text.rsplit("```", 1)[0]
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _encoding() -> Optional[tiktoken.Encoding]:
+    """gpt-4 tokenizer, or None when its BPE file cannot be fetched (e.g. no network)"""
+    try:
+        return tiktoken.encoding_for_model("gpt-4")
+    except Exception:
+        return None
+
+
+def load_tokenizer() -> None:
+    """Load the tokenizer once at startup; the first load may download over HTTP, so run it off the event loop"""
+    _encoding()
+
+
+def _token_count(text: str) -> int:
+    """Exact token count when the tokenizer is available, else a ~4 characters per token estimate"""
+    encoding = _encoding()
+    if encoding is None:
+        return len(text) // 4 + 1
+    return len(encoding.encode(text))
+
+
+def _summarize_transactions(transactions: List[Dict], max_tokens: int) -> str:
+    """Aggregate transactions into weekly totals per type/category, trimmed to a token budget.
+
+    Weekly sums carry the same spending-pattern signal as raw rows at a fraction of
+    the tokens; when still over budget the smallest totals are dropped first.
+    """
+    groups: Dict[tuple, List[float]] = {}
+    for t in transactions:
+        date = t.get("date")
+        if isinstance(date, str):
+            date = datetime.fromisoformat(date)
+        if date:
+            year, week, _ = date.isocalendar()
+            period = f"{year}-W{week:02d}"
+        else:
+            period = "unknown"
+        bucket = groups.setdefault((period, t.get("type"), t.get("category")), [0.0, 0])
+        bucket[0] += t["amount"]
+        bucket[1] += 1
+
+    rows = [
+        {"week": week, "type": type_, "category": category, "total": round(total, 2), "count": int(count)}
+        for (week, type_, category), (total, count) in groups.items()
+    ]
+    rows.sort(key=lambda r: abs(r["total"]), reverse=True)
+
+    kept, used = [], 2  # surrounding brackets
+    for row in rows:
+        cost = _token_count(_dumps(row)) + 1
+        if used + cost > max_tokens:
+            break
+        kept.append(row)
+        used += cost
+    kept.sort(key=lambda r: (r["week"], str(r["type"]), str(r["category"])))
+    return _dumps(kept)
+
 
 class AIService:
-    def __init__(self):
-        self.llm = ChatOpenAI(
+    # Prompt templates are compiled once per process and only formatted per call
+    GOAL_PROMPT = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_GOAL),
+        ("human", """
+            User Input: {user_input}
+            User Context: {user_context}
+            
+            Extract the financial goal and create a detailed plan with reasoning.
+            """)
+    ])
+
+    SPENDING_PROMPT = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_SPEND),
+        ("human", """
+            Windows: {window_count}
+            Each window lists weekly totals (total, count) per transaction type and category.
+
+            {windows}
+            
+            Analyze spending patterns for every window and provide detailed insights with specific recommendations.
+            """)
+    ])
+
+    RECOMMENDATION_PROMPT = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_REC),
+        ("human", """
+            Product: {product}
+            User Profile: {user_profile}
+            
+            Provide a detailed explanation of why this product is recommended, including:
+            1. Match with user's risk tolerance
+            2. Alignment with financial goals
+            3. Expected benefits
+            4. Any considerations or risks
+            """)
+    ])
+
+    RECOMMENDATION_BATCH_PROMPT = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_REC_BATCH),
+        ("human", """
+            Products: {product_count}
+            {products}
+            User Profile: {user_profile}
+            
+            For every product, provide a detailed explanation of why it is recommended, including:
+            1. Match with user's risk tolerance
+            2. Alignment with financial goals
+            3. Expected benefits
+            4. Any considerations or risks
+            """)
+    ])
+
+    CHAT_PROMPT = ChatPromptTemplate.from_messages([
+        ("system", SYSTEM_CHAT),
+        # Prior turns as native messages: an append-only, cache-friendly prefix
+        MessagesPlaceholder(variable_name="history"),
+        ("human", """
+            Context: {context}
+
+            User Message: {message}
+            
+            Provide a helpful response with clear reasoning.
+            """)
+    ])
+
+    @cached_property
+    def llm(self) -> ChatOpenAI:
+        """Chat model client, built on first use; sampled output, so never cached"""
+        return ChatOpenAI(
             model="gpt-4",
             temperature=0.7,
-            api_key=settings.OPENAI_API_KEY
+            api_key=get_settings().OPENAI_API_KEY,
+            cache=False
+        )
+
+    @cached_property
+    def deterministic_llm(self) -> ChatOpenAI:
+        """Temperature-0 client for spending analysis and reasoning; repeated prompts hit the LLM cache"""
+        return ChatOpenAI(
+            model="gpt-4",
+            temperature=0,
+            api_key=get_settings().OPENAI_API_KEY,
+            cache=True
         )
     
     async def understand_goal(self, user_input: str, user_context: Dict) -> Dict:
         """Extract and understand financial goals from natural language"""
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="""You are a financial planning assistant. 
-            Extract financial goals from user input and create a structured plan.
-            Return a JSON object with: title, description, goal_type, target_amount, target_date, monthly_contribution, reasoning.
-            Consider user's income, age, and risk tolerance when creating the plan."""),
-            HumanMessage(content=f"""
-            User Input: {user_input}
-            User Context: {json.dumps(user_context)}
-            
-            Extract the financial goal and create a detailed plan with reasoning.
-            """)
-        ])
-        
-        messages = prompt.format_messages()
+        messages = self.GOAL_PROMPT.format_messages(
+            user_input=user_input,
+            user_context=_dumps(user_context)
+        )
         response = await self.llm.ainvoke(messages)
         try:
-            return json.loads(response.content)
+            return orjson.loads(response.content)
         except:
             # Fallback parsing
             return {"reasoning": response.content, "goal_data": {}}
     
     async def analyze_spending(self, transactions: List[Dict]) -> Dict:
         """Analyze spending patterns and suggest savings"""
-        transactions_summary = json.dumps(transactions[:50])  # Limit for token usage
-        
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="""You are a financial behavior analyst.
-            Analyze spending patterns and provide actionable savings suggestions.
-            Return JSON with: insights, categories_analysis, savings_opportunities, recommendations."""),
-            HumanMessage(content=f"""
-            Transactions: {transactions_summary}
-            
-            Analyze spending patterns and provide detailed insights with specific recommendations.
-            """)
-        ])
-        
-        messages = prompt.format_messages()
-        response = await self.llm.ainvoke(messages)
-        try:
-            return json.loads(response.content)
-        except:
-            return {"insights": response.content, "recommendations": []}
+        results = await self.analyze_spending_batch([{"id": 0, "transactions": transactions}])
+        return results[0]
+
+    async def analyze_spending_batch(self, windows: List[Dict]) -> List[Dict]:
+        """Analyze several transaction windows in one call sharing a single system prompt.
+
+        Each window is ``{"id": ..., "transactions": [...]}``; results come back in
+        the same order. Keep batches to roughly 8-16 windows.
+        """
+        if not windows:
+            return []
+        budget = max(SPEND_TOKEN_BUDGET // len(windows), 200)
+        windows_text = "\n\n".join(
+            f"### Window {w['id']}\n{_summarize_transactions(w['transactions'], budget)}"
+            for w in windows
+        )
+
+        messages = self.SPENDING_PROMPT.format_messages(
+            window_count=len(windows),
+            windows=windows_text
+        )
+        response = await self.deterministic_llm.ainvoke(messages)
+        parsed = _loads_json(response.content)
+        if isinstance(parsed, dict):
+            parsed = [{"id": windows[0]["id"], **parsed}]
+        by_id = {
+            str(item.get("id")): item for item in parsed if isinstance(item, dict)
+        } if isinstance(parsed, list) else {}
+        return [
+            by_id.get(str(w["id"]), {"insights": response.content, "recommendations": []})
+            for w in windows
+        ]
     
     async def generate_recommendation_reasoning(
         self, 
@@ -67,24 +299,70 @@ class AIService:
         user_profile: Dict
     ) -> str:
         """Generate explainable reasoning for product recommendations"""
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="""You are a financial advisor providing explainable recommendations.
-            Explain why a product is suitable for the user in clear, understandable terms."""),
-            HumanMessage(content=f"""
-            Product: {json.dumps(product)}
-            User Profile: {json.dumps(user_profile)}
-            
-            Provide a detailed explanation of why this product is recommended, including:
-            1. Match with user's risk tolerance
-            2. Alignment with financial goals
-            3. Expected benefits
-            4. Any considerations or risks
-            """)
-        ])
+        product_json = _dumps(product)
+        profile_json = _dumps(_profile_bucket(user_profile))
+        key = (product_json, profile_json)
+        cached = _reasoning_cache.get(key)
+        if cached is not None:
+            return cached
         
-        messages = prompt.format_messages()
-        response = await self.llm.ainvoke(messages)
+        messages = self.RECOMMENDATION_PROMPT.format_messages(
+            product=product_json,
+            user_profile=profile_json
+        )
+        # Deterministic output keeps this endpoint cache-friendly
+        response = await self.deterministic_llm.ainvoke(messages)
+        _reasoning_cache[key] = response.content
         return response.content
+
+    async def generate_recommendation_reasoning_batch(
+        self,
+        products: List[Dict],
+        user_profile: Dict
+    ) -> List[str]:
+        """Generate reasoning for several products in one call; results come back in order.
+
+        Products already in the reasoning cache are not sent to the model, and any
+        product the batch reply does not cover is explained on its own.
+        """
+        profile_json = _dumps(_profile_bucket(user_profile))
+        keys = [(_dumps(product), profile_json) for product in products]
+        results = [_reasoning_cache.get(key) for key in keys]
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        by_id: Dict[str, str] = {}
+        if len(missing) > 1:
+            products_text = "\n".join(
+                f"### Product {i}\n{keys[i][0]}" for i in missing
+            )
+            messages = self.RECOMMENDATION_BATCH_PROMPT.format_messages(
+                product_count=len(missing),
+                products=products_text,
+                user_profile=profile_json
+            )
+            # Deterministic output keeps this endpoint cache-friendly
+            response = await self.deterministic_llm.ainvoke(messages)
+            parsed = _loads_json(response.content)
+            if isinstance(parsed, list):
+                by_id = {
+                    str(item.get("id")): item["reasoning"]
+                    for item in parsed
+                    if isinstance(item, dict) and isinstance(item.get("reasoning"), str)
+                }
+        
+        for i in missing:
+            if str(i) in by_id:
+                results[i] = by_id[str(i)]
+                _reasoning_cache[keys[i]] = results[i]
+        
+        unanswered = [i for i in missing if results[i] is None]
+        singles = await asyncio.gather(*[
+            self.generate_recommendation_reasoning(products[i], user_profile)
+            for i in unanswered
+        ])
+        for i, reasoning in zip(unanswered, singles):
+            results[i] = reasoning
+        return results
     
     async def chat_response(
         self,
@@ -93,28 +371,17 @@ class AIService:
         history: Optional[List[Dict]] = None
     ) -> Dict:
         """Generate chat response with short conversation history for context"""
-        context_str = json.dumps(context) if context else "No additional context"
-        history = history or []
-        formatted_history = "\n".join(
-            [f"{turn['role']}: {turn['content']}" for turn in history[-10:]]
-        )
-
-        prompt = ChatPromptTemplate.from_messages([
-            SystemMessage(content="""You are a helpful financial assistant.
-            Provide clear, actionable financial advice. Always explain your reasoning.
-            Be empathetic and supportive. Keep answers concise and numbered when listing steps."""),
-            HumanMessage(content=f"""
-            Recent History:
-            {formatted_history or "No prior messages"}
+        context_str = _dumps(context) if context else "No additional context"
+        history_messages = [
+            (HumanMessage if turn["role"] == "user" else AIMessage)(content=turn["content"])
+            for turn in (history or [])[-10:]
+        ]
 
-            User Message: {message}
-            Context: {context_str}
-            
-            Provide a helpful response with clear reasoning.
-            """)
-        ])
-        
-        messages = prompt.format_messages()
+        messages = self.CHAT_PROMPT.format_messages(
+            history=history_messages,
+            message=message,
+            context=context_str
+        )
         response = await self.llm.ainvoke(messages)
         return {
             "response": response.content,
@@ -122,3 +389,7 @@ class AIService:
             "confidence": 0.85
         }
 
+
+@lru_cache(maxsize=1)
+def get_ai_service() -> AIService:
+    return AIService()
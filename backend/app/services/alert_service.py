@@ -1,35 +1,63 @@
 """
 Alert Service for Predictive Financial Alerts
 """
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
-from datetime import datetime, timedelta
+from typing import List, Optional, Set
+from functools import lru_cache
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, case, func, select, update
+from datetime import datetime, timedelta, timezone
 from app.models.alert import Alert, AlertType, AlertPriority
 from app.models.goal import Goal
 from app.models.obligation import Obligation, ObligationStatus
 from app.models.transaction import Transaction, TransactionType
 from app.models.user import User
 
+
+def _as_utc(value: datetime) -> datetime:
+    """Aware UTC datetime for a stored timestamp; SQLite hands back naive values"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
 class AlertService:
-    def check_low_balance(self, db: Session, user_id: int, threshold: float = 10000) -> Optional[Alert]:
-        """Check for low account balance"""
-        # Calculate current balance from transactions
-        total_income = db.query(func.sum(Transaction.amount)).filter(
-            and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == TransactionType.INCOME
-            )
-        ).scalar() or 0
-        
-        total_expenses = db.query(func.sum(Transaction.amount)).filter(
+    def _alerted_entity_ids(
+        self,
+        db: Session,
+        user_id: int,
+        entity_type: str,
+        alert_types: List[AlertType],
+        entity_ids: List[int]
+    ) -> Set[int]:
+        """Ids among entity_ids that already have an unread alert of the given types"""
+        if not entity_ids:
+            return set()
+        rows = db.query(Alert.entity_id).filter(
             and_(
-                Transaction.user_id == user_id,
-                Transaction.transaction_type == TransactionType.EXPENSE
+                Alert.user_id == user_id,
+                Alert.alert_type.in_(alert_types),
+                Alert.entity_type == entity_type,
+                Alert.entity_id.in_(entity_ids),
+                Alert.is_read == False
             )
-        ).scalar() or 0
+        ).all()
+        return {row.entity_id for row in rows}
+    
+    def check_low_balance(self, db: Session, user_id: int, threshold: float = 10000) -> Optional[Alert]:
+        """Build a low balance alert if needed; the caller persists it"""
+        # Calculate current balance from transactions in a single pass
+        totals = db.query(
+            func.coalesce(func.sum(case(
+                (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+                else_=0
+            )), 0).label("income"),
+            func.coalesce(func.sum(case(
+                (Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount),
+                else_=0
+            )), 0).label("expenses")
+        ).filter(Transaction.user_id == user_id).one()
         
-        balance = total_income - total_expenses
+        balance = totals.income - totals.expenses
         
         if balance < threshold:
             # Check if alert already exists
@@ -48,41 +76,36 @@ class AlertService:
                     title="Low Account Balance",
                     message=f"Your account balance ({balance:.2f}) is below the recommended threshold ({threshold}).",
                     priority=AlertPriority.HIGH,
-                    alert_metadata=f'{{"balance": {balance}, "threshold": {threshold}}}'
+                    alert_metadata={"balance": balance, "threshold": threshold}
                 )
-                db.add(alert)
-                db.commit()
                 return alert
         
         return None
     
     def check_goal_deadlines(self, db: Session, user_id: int) -> List[Alert]:
-        """Check for approaching goal deadlines"""
+        """Build alerts for approaching goal deadlines; the caller persists them"""
         alerts = []
-        thirty_days_from_now = datetime.now() + timedelta(days=30)
+        # One aware clock read: the date columns are timezone-aware
+        now = datetime.now(timezone.utc)
+        thirty_days_from_now = now + timedelta(days=30)
         
         goals = db.query(Goal).filter(
             and_(
                 Goal.user_id == user_id,
                 Goal.status == "active",
                 Goal.target_date <= thirty_days_from_now,
-                Goal.target_date >= datetime.now()
+                Goal.target_date >= now
             )
         ).all()
         
+        # Goals that already have an unread deadline alert, fetched in one query
+        alerted_ids = self._alerted_entity_ids(
+            db, user_id, "goal", [AlertType.GOAL_DEADLINE], [g.id for g in goals]
+        )
+        
         for goal in goals:
-            # Check if alert already exists
-            existing = db.query(Alert).filter(
-                and_(
-                    Alert.user_id == user_id,
-                    Alert.alert_type == AlertType.GOAL_DEADLINE,
-                    Alert.alert_metadata.contains(f'"goal_id": {goal.id}'),
-                    Alert.is_read == False
-                )
-            ).first()
-            
-            if not existing:
-                days_remaining = (goal.target_date - datetime.now()).days
+            if goal.id not in alerted_ids:
+                days_remaining = (_as_utc(goal.target_date) - now).days
                 progress = (goal.current_amount / goal.target_amount) * 100
                 
                 alert = Alert(
@@ -91,14 +114,12 @@ class AlertService:
                     title=f"Goal Deadline Approaching: {goal.title}",
                     message=f"Your goal '{goal.title}' deadline is in {days_remaining} days. Current progress: {progress:.1f}%",
                     priority=AlertPriority.MEDIUM if progress > 50 else AlertPriority.HIGH,
-                    alert_metadata=f'{{"goal_id": {goal.id}, "days_remaining": {days_remaining}, "progress": {progress}}}'
+                    alert_metadata={"goal_id": goal.id, "days_remaining": days_remaining, "progress": progress},
+                    entity_type="goal",
+                    entity_id=goal.id
                 )
-                db.add(alert)
                 alerts.append(alert)
         
-        if alerts:
-            db.commit()
-        
         return alerts
     
     def check_budget_exceeded(
@@ -107,44 +128,50 @@ class AlertService:
         user_id: int, 
         category: Optional[str] = None
     ) -> Optional[Alert]:
-        """Check if budget is exceeded for current month"""
+        """Build an alert if the current month's budget is exceeded; the caller persists it"""
         now = datetime.now()
         start_of_month = datetime(now.year, now.month, 1)
         
         # This is a simplified check - in production, you'd have budget limits per category
-        total_expenses = db.query(func.sum(Transaction.amount)).filter(
+        month_expenses = select(func.coalesce(func.sum(Transaction.amount), 0)).where(
             and_(
                 Transaction.user_id == user_id,
                 Transaction.transaction_type == TransactionType.EXPENSE,
                 Transaction.date >= start_of_month
             )
-        ).scalar() or 0
+        ).scalar_subquery()
         
-        # Get user income to estimate budget
-        user = db.query(User).filter(User.id == user_id).first()
-        if user and user.income:
-            estimated_budget = user.income * 0.8  # Assume 80% of income as budget
+        existing_alert = select(Alert.id).where(
+            and_(
+                Alert.user_id == user_id,
+                Alert.alert_type == AlertType.BUDGET_EXCEEDED,
+                Alert.is_read == False,
+                Alert.created_at >= start_of_month
+            )
+        ).exists()
+        
+        # User income, month-to-date expenses and the dedup probe in one round-trip
+        row = db.execute(
+            select(
+                User.income,
+                month_expenses.label("expenses"),
+                existing_alert.label("has_alert")
+            ).where(User.id == user_id)
+        ).one_or_none()
+        
+        if row and row.income:
+            total_expenses = row.expenses
+            estimated_budget = row.income * 0.8  # Assume 80% of income as budget
             if total_expenses > estimated_budget:
-                existing = db.query(Alert).filter(
-                    and_(
-                        Alert.user_id == user_id,
-                        Alert.alert_type == AlertType.BUDGET_EXCEEDED,
-                        Alert.is_read == False,
-                        func.date(Alert.created_at) >= start_of_month.date()
-                    )
-                ).first()
-                
-                if not existing:
+                if not row.has_alert:
                     alert = Alert(
                         user_id=user_id,
                         alert_type=AlertType.BUDGET_EXCEEDED,
                         title="Monthly Budget Exceeded",
                         message=f"You have exceeded your estimated monthly budget. Expenses: {total_expenses:.2f}, Budget: {estimated_budget:.2f}",
                         priority=AlertPriority.HIGH,
-                        alert_metadata=f'{{"expenses": {total_expenses}, "budget": {estimated_budget}}}'
+                        alert_metadata={"expenses": total_expenses, "budget": estimated_budget}
                     )
-                    db.add(alert)
-                    db.commit()
                     return alert
         
         return None
@@ -154,10 +181,13 @@ class AlertService:
         db: Session, 
         user_id: int, 
         is_read: Optional[bool] = None,
-        limit: int = 50
+        limit: int = 50,
+        fields: Optional[List[str]] = None
     ) -> List[Alert]:
-        """Get alerts for a user"""
+        """Get alerts for a user, optionally loading only the given columns"""
         query = db.query(Alert).filter(Alert.user_id == user_id)
+        if fields:
+            query = query.options(load_only(*[getattr(Alert, f) for f in fields]))
         
         if is_read is not None:
             query = query.filter(Alert.is_read == is_read)
@@ -166,15 +196,13 @@ class AlertService:
     
     def mark_alert_read(self, db: Session, alert_id: int, user_id: int) -> bool:
         """Mark an alert as read"""
-        alert = db.query(Alert).filter(
-            and_(Alert.id == alert_id, Alert.user_id == user_id)
-        ).first()
-        
-        if alert:
-            alert.is_read = True
-            db.commit()
-            return True
-        return False
+        result = db.execute(
+            update(Alert)
+            .where(and_(Alert.id == alert_id, Alert.user_id == user_id))
+            .values(is_read=True)
+        )
+        db.commit()
+        return result.rowcount > 0
 
     def check_obligations_due(
         self,
@@ -182,8 +210,8 @@ class AlertService:
         user_id: int,
         days_before: int = 5
     ) -> List[Alert]:
-        """Generate alerts for obligations that are due soon or past due."""
-        now = datetime.now()
+        """Build alerts for obligations that are due soon or past due; the caller persists them."""
+        now = datetime.now(timezone.utc)
         soon = now + timedelta(days=days_before)
         alerts: List[Alert] = []
 
@@ -194,10 +222,19 @@ class AlertService:
             )
         ).all()
 
+        alerted_ids = self._alerted_entity_ids(
+            db,
+            user_id,
+            "obligation",
+            [AlertType.DUE_SOON, AlertType.PAST_DUE],
+            [o.id for o in obligations]
+        )
+
         for obligation in obligations:
             due_date = obligation.next_due_date or obligation.due_date
             if not due_date:
                 continue
+            due_date = _as_utc(due_date)
 
             is_past_due = due_date < now
             is_due_soon = now <= due_date <= soon
@@ -205,16 +242,7 @@ class AlertService:
             if not (is_past_due or is_due_soon):
                 continue
 
-            existing = db.query(Alert).filter(
-                and_(
-                    Alert.user_id == user_id,
-                    Alert.alert_type.in_([AlertType.DUE_SOON, AlertType.PAST_DUE]),
-                    Alert.alert_metadata.contains(f'"obligation_id": {obligation.id}'),
-                    Alert.is_read == False
-                )
-            ).first()
-
-            if existing:
+            if obligation.id in alerted_ids:
                 continue
 
             alert_type = AlertType.PAST_DUE if is_past_due else AlertType.DUE_SOON
@@ -231,14 +259,12 @@ class AlertService:
                 title=f"Payment Reminder: {obligation.title}",
                 message=message,
                 priority=AlertPriority.HIGH if is_past_due else AlertPriority.MEDIUM,
-                alert_metadata=f'{{"obligation_id": {obligation.id}, "due_date": "{due_date.isoformat()}"}}'
+                alert_metadata={"obligation_id": obligation.id, "due_date": due_date.isoformat()},
+                entity_type="obligation",
+                entity_id=obligation.id
             )
-            db.add(alert)
             alerts.append(alert)
 
-        if alerts:
-            db.commit()
-
         return alerts
     
     def generate_all_alerts(self, db: Session, user_id: int) -> List[Alert]:
@@ -260,5 +286,14 @@ class AlertService:
         if budget_alert:
             alerts.append(budget_alert)
         
+        # Persist the whole sweep in one transaction
+        if alerts:
+            db.add_all(alerts)
+            db.commit()
+        
         return alerts
 
+
+@lru_cache(maxsize=1)
+def get_alert_service() -> AlertService:
+    return AlertService()
@@ -2,15 +2,17 @@
 Budget Service with AI-powered Insights
 """
 from typing import List, Dict, Optional
+from functools import lru_cache
+import asyncio
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import and_, case, func
 from datetime import datetime, timedelta
 from app.models.transaction import Transaction, TransactionType, TransactionCategory
-from app.services.ai_service import AIService
+from app.services.ai_service import get_ai_service
 
 class BudgetService:
     def __init__(self):
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
     
     def get_transactions(
         self, 
@@ -54,55 +56,104 @@ class BudgetService:
             else:
                 end_date = datetime(now.year, now.month + 1, 1)
         
-        transactions = self.get_transactions(db, user_id, start_date, end_date)
-        
-        # Convert to dict for AI analysis
-        transactions_data = [
-            {
-                "amount": t.amount,
-                "type": t.transaction_type.value,
-                "category": t.category.value,
-                "description": t.description,
-                "date": t.date.isoformat()
-            }
-            for t in transactions
-        ]
+        # Sync DB work runs off the event loop so other requests keep being served
+        transactions_data = await asyncio.to_thread(
+            self.get_analysis_rows, db, user_id, start_date, end_date
+        )
         
-        # Get AI analysis
-        ai_analysis = await self.ai_service.analyze_spending(transactions_data)
+        # Start the AI analysis now and collect it once the summary is built
+        ai_task = asyncio.create_task(self.ai_service.analyze_spending(transactions_data))
         
-        # Calculate summary statistics
-        total_income = sum(
-            t.amount for t in transactions 
-            if t.transaction_type == TransactionType.INCOME
-        )
-        total_expenses = sum(
-            t.amount for t in transactions 
-            if t.transaction_type == TransactionType.EXPENSE
-        )
+        # Aggregate in the database while the AI call is in flight; don't leave
+        # the task running unobserved if the summary fails
+        try:
+            summary = await asyncio.to_thread(
+                self.get_period_summary, db, user_id, start_date, end_date
+            )
+        except BaseException:
+            ai_task.cancel()
+            raise
+        total_income = summary["total_income"]
+        total_expenses = summary["total_expenses"]
         
-        # Category breakdown
-        category_breakdown = {}
-        for t in transactions:
-            if t.transaction_type == TransactionType.EXPENSE:
-                category_breakdown[t.category.value] = (
-                    category_breakdown.get(t.category.value, 0) + t.amount
-                )
+        ai_analysis = await ai_task
         
         return {
             "period": {
-                "start": start_date.isoformat(),
-                "end": end_date.isoformat()
+                "start": start_date,
+                "end": end_date
             },
             "summary": {
                 "total_income": total_income,
                 "total_expenses": total_expenses,
                 "net": total_income - total_expenses
             },
-            "category_breakdown": category_breakdown,
+            "category_breakdown": summary["category_breakdown"],
             "ai_insights": ai_analysis
         }
     
+    def get_analysis_rows(
+        self,
+        db: Session,
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime,
+        limit: int = 100
+    ) -> List[Dict]:
+        """Latest transactions of a period as plain dicts, selecting only the columns the AI analysis reads"""
+        rows = db.query(
+            Transaction.amount, Transaction.transaction_type, Transaction.category, Transaction.date
+        ).filter(
+            Transaction.user_id == user_id,
+            Transaction.date >= start_date,
+            Transaction.date < end_date
+        ).order_by(Transaction.date.desc()).limit(limit).all()
+        
+        return [
+            {
+                "amount": amount,
+                "type": transaction_type.value,
+                "category": category.value,
+                "date": date
+            }
+            for amount, transaction_type, category, date in rows
+        ]
+    
+    def get_period_summary(
+        self,
+        db: Session,
+        user_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict:
+        """Income/expense totals and per-category expenses for a period, aggregated in SQL"""
+        in_period = and_(
+            Transaction.user_id == user_id,
+            Transaction.date >= start_date,
+            Transaction.date < end_date
+        )
+        totals = db.query(
+            func.coalesce(func.sum(case(
+                (Transaction.transaction_type == TransactionType.INCOME, Transaction.amount),
+                else_=0
+            )), 0).label("income"),
+            func.coalesce(func.sum(case(
+                (Transaction.transaction_type == TransactionType.EXPENSE, Transaction.amount),
+                else_=0
+            )), 0).label("expenses")
+        ).filter(in_period).one()
+        
+        rows = db.query(Transaction.category, func.sum(Transaction.amount)).filter(
+            in_period,
+            Transaction.transaction_type == TransactionType.EXPENSE
+        ).group_by(Transaction.category).all()
+        
+        return {
+            "total_income": float(totals.income),
+            "total_expenses": float(totals.expenses),
+            "category_breakdown": {category.value: float(amount) for category, amount in rows}
+        }
+    
     def get_category_spending(
         self, 
         db: Session, 
@@ -128,3 +179,7 @@ class BudgetService:
         result = query.scalar()
         return result or 0.0
 
+
+@lru_cache(maxsize=1)
+def get_budget_service() -> BudgetService:
+    return BudgetService()
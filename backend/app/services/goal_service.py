@@ -2,14 +2,15 @@
 Goal Service with AI Integration
 """
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from sqlalchemy.orm import Session, defer, load_only
 from app.models.goal import Goal, GoalStatus
 from app.schemas.goal import GoalCreate, GoalUpdate
-from app.services.ai_service import AIService
+from app.services.ai_service import get_ai_service
 
 class GoalService:
     def __init__(self):
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
     
     async def create_goal(
         self, 
@@ -26,16 +27,29 @@ class GoalService:
             goal.description or goal.title,
             user_context
         )
-        db_goal.ai_plan = str(ai_plan_data)
+        db_goal.ai_plan = ai_plan_data
         
         db.add(db_goal)
         db.commit()
         db.refresh(db_goal)
         return db_goal
     
-    def get_goals(self, db: Session, user_id: int, skip: int = 0, limit: int = 100) -> List[Goal]:
-        """Get all goals for a user"""
-        return db.query(Goal).filter(Goal.user_id == user_id).offset(skip).limit(limit).all()
+    def get_goals(
+        self,
+        db: Session,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        fields: Optional[List[str]] = None
+    ) -> List[Goal]:
+        """Get all goals for a user, optionally loading only the given columns"""
+        query = db.query(Goal).filter(Goal.user_id == user_id)
+        if fields:
+            query = query.options(load_only(*[getattr(Goal, f) for f in fields]))
+        else:
+            # The AI plan is only served by the single-goal endpoint
+            query = query.options(defer(Goal.ai_plan))
+        return query.offset(skip).limit(limit).all()
     
     def get_goal(self, db: Session, goal_id: int, user_id: int) -> Optional[Goal]:
         """Get a specific goal"""
@@ -71,3 +85,7 @@ class GoalService:
         db.commit()
         return True
 
+
+@lru_cache(maxsize=1)
+def get_goal_service() -> GoalService:
+    return GoalService()
@@ -3,13 +3,16 @@ Service for managing recurring financial obligations
 """
 from sqlalchemy.orm import Session
 from typing import List
+from functools import lru_cache
 from app.models.obligation import Obligation
 from app.schemas.obligation import ObligationCreate
 
 
 class ObligationService:
     def create_obligation(self, db: Session, user_id: int, payload: ObligationCreate) -> Obligation:
-        obligation = Obligation(**payload.model_dump(), user_id=user_id)
+        data = payload.model_dump()
+        data["extra_metadata"] = data.pop("metadata")
+        obligation = Obligation(**data, user_id=user_id)
         db.add(obligation)
         db.commit()
         db.refresh(obligation)
@@ -26,3 +29,7 @@ class ObligationService:
         db.commit()
         return True
 
+
+@lru_cache(maxsize=1)
+def get_obligation_service() -> ObligationService:
+    return ObligationService()
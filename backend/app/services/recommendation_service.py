@@ -2,17 +2,110 @@
 Recommendation Service with AI-powered Product Matching
 """
 from typing import Optional
-from typing import List, Dict
-from sqlalchemy.orm import Session
-from app.models.product import Product, ProductType, RiskLevel
+from functools import lru_cache
+import threading
+import time
+from typing import List, Dict, NamedTuple
+import numpy as np
+from cachetools import TTLCache
+from sqlalchemy import and_, event, func
+from sqlalchemy.orm import Session, load_only
+from app.models.product import Product, ProductType, RiskLevel, RISK_ORDINALS
 from app.models.goal import Goal
 from app.models.user import User
 from app.schemas.product import ProductRecommendation
-from app.services.ai_service import AIService
+from app.services.ai_service import get_ai_service
+
+_TYPE_CODES = {product_type: code for code, product_type in enumerate(ProductType)}
+
+
+def _type_codes(*product_types: ProductType) -> np.ndarray:
+    return np.array([_TYPE_CODES[t] for t in product_types], dtype=np.int8)
+
+
+# Product types favoured by the age and goal horizon rules
+_YOUTH_TYPES = _type_codes(ProductType.MUTUAL_FUND, ProductType.SIP)
+_SENIOR_TYPES = _type_codes(ProductType.FD, ProductType.PPF)
+_SHORT_HORIZON_TYPES = _type_codes(ProductType.FD, ProductType.RD, ProductType.CREDIT_CARD)
+_LONG_HORIZON_TYPES = _type_codes(ProductType.MUTUAL_FUND, ProductType.SIP, ProductType.INSURANCE, ProductType.PPF)
+
+# User risk tolerance -> risk ordinal of the products that fit it
+_USER_RISK_ORDINALS = {
+    "conservative": RISK_ORDINALS[RiskLevel.LOW],
+    "moderate": RISK_ORDINALS[RiskLevel.MEDIUM],
+    "aggressive": RISK_ORDINALS[RiskLevel.HIGH]
+}
+
+
+class _Catalog(NamedTuple):
+    """Scoring inputs for the whole product catalog, one array per field"""
+    ids: np.ndarray
+    risk: np.ndarray
+    types: np.ndarray
+    min_investment: np.ndarray
+    annual_fee: np.ndarray
+    has_rewards: np.ndarray
+
+
+class _Scores(NamedTuple):
+    """Match scores for the catalog plus the rule outcomes the suitability factors reuse"""
+    total: np.ndarray
+    risk_match: np.ndarray
+    affordable_minimum: np.ndarray
+
+
+class _IncomeLimits(NamedTuple):
+    """Income-derived thresholds, computed once per request"""
+    max_minimum: float  # 10%: affordable minimum investment, and the recommended floor
+    max_card_fee: float  # 2%: cheap credit card annual fee
+    default_investment: float  # 15%: recommendation when a product has no minimum
+
+    @classmethod
+    def for_income(cls, income: Optional[float]) -> Optional["_IncomeLimits"]:
+        if not income:
+            return None
+        return cls(income * 0.1, income * 0.02, income * 0.15)
+
+
+# Seconds a loaded catalog is trusted before its version is re-checked
+_CATALOG_TTL = 60
+_catalog_cache: Dict = {"version": None, "catalog": None, "expires": 0.0}
+
+# Serialized /products pages keyed by (skip, limit); cleared with the catalog on any product write.
+# Handlers run on worker threads and TTLCache is not thread-safe, so every access holds the lock.
+# The generation stops a page built before a write from being stored after it.
+_products_page_cache: TTLCache = TTLCache(maxsize=64, ttl=300)
+_products_page_lock = threading.Lock()
+_products_page_state: Dict = {"generation": 0}
+
+
+def get_products_page(key):
+    """Cached page for key (or None) and the cache generation to pass to store_products_page"""
+    with _products_page_lock:
+        return _products_page_cache.get(key), _products_page_state["generation"]
+
+
+def store_products_page(key, payload, generation: int) -> None:
+    """Cache a page unless a product write invalidated the cache since generation was read"""
+    with _products_page_lock:
+        if generation == _products_page_state["generation"]:
+            _products_page_cache[key] = payload
+
+
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+def _invalidate_catalog(mapper, connection, target) -> None:
+    _catalog_cache["expires"] = 0.0
+    _catalog_cache["version"] = None
+    with _products_page_lock:
+        _products_page_cache.clear()
+        _products_page_state["generation"] += 1
+
 
 class RecommendationService:
     def __init__(self):
-        self.ai_service = AIService()
+        self.ai_service = get_ai_service()
     
     async def get_recommendations(
         self, 
@@ -22,8 +115,19 @@ class RecommendationService:
         limit: int = 5
     ) -> List[ProductRecommendation]:
         """Get personalized product recommendations"""
-        # Get user profile
-        user = db.query(User).filter(User.id == user_id).first()
+        # Get user profile, and the optional goal in the same round-trip
+        query = db.query(User).options(
+            load_only(User.id, User.age, User.income, User.risk_tolerance)
+        ).filter(User.id == user_id)
+        if goal_id:
+            row = query.add_entity(Goal).outerjoin(
+                Goal, and_(Goal.id == goal_id, Goal.user_id == User.id)
+            ).options(
+                load_only(Goal.id, Goal.target_date, Goal.created_at)
+            ).first()
+            user, goal = row if row else (None, None)
+        else:
+            user, goal = query.first(), None
         if not user:
             return []
         
@@ -34,123 +138,165 @@ class RecommendationService:
         }
         
         # Optional goal context
-        goal = None
         goal_horizon_months = None
-        if goal_id:
-            goal = db.query(Goal).filter(Goal.id == goal_id, Goal.user_id == user_id).first()
-            if goal and goal.target_date:
-                delta_days = (goal.target_date - goal.created_at).days if goal.created_at else None
-                if delta_days and delta_days > 0:
-                    goal_horizon_months = max(delta_days / 30, 1)
-
-        # Get all products
-        products = db.query(Product).all()
+        if goal and goal.target_date:
+            delta_days = (goal.target_date - goal.created_at).days if goal.created_at else None
+            if delta_days and delta_days > 0:
+                goal_horizon_months = max(delta_days / 30, 1)
+
+        limits = _IncomeLimits.for_income(user.income)
+
+        # Pass 1: score the whole (cached) catalog at once and keep the best matches
+        catalog = self._get_catalog(db)
+        scored = self._score_products(catalog, user_profile, limits, goal_horizon_months)
+        scores = scored.total
+        candidates = np.flatnonzero(scores > 0.5)  # Only recommend if match > 50%
+        
+        # Sort by match score; only the returned products are loaded and need AI reasoning
+        top = candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+        top_ids = [int(catalog.ids[i]) for i in top]
+        products = {
+            product.id: product
+            for product in db.query(Product).filter(Product.id.in_(top_ids)).all()
+        } if top_ids else {}
+        matched = [
+            (products[product_id], i)
+            for product_id, i in zip(top_ids, top)
+            if product_id in products
+        ]
         
-        recommendations = []
-        for product in products:
-            # Basic matching logic
-            match_score = self._calculate_match_score(product, user_profile, goal_horizon_months)
-            
-            if match_score > 0.5:  # Only recommend if match > 50%
-                # Generate AI reasoning
-                reasoning = await self.ai_service.generate_recommendation_reasoning(
-                    {
-                        "name": product.name,
-                        "type": product.product_type.value,
-                        "risk_level": product.risk_level.value,
-                        "expected_return": product.expected_return,
-                        "min_investment": product.min_investment
-                    },
-                    user_profile
-                )
-                
-                # Determine suitability factors
-                suitability_factors = self._get_suitability_factors(product, user_profile, goal_horizon_months)
-                
-                recommendation = ProductRecommendation(
-                    product=product,
-                    match_score=match_score,
-                    reasoning=reasoning,
-                    suitability_factors=suitability_factors,
-                    recommended_investment=self._calculate_recommended_investment(
-                        product, user_profile
-                    )
-                )
-                recommendations.append(recommendation)
+        # Pass 2: generate AI reasoning for all matches in a single call
+        reasonings = await self.ai_service.generate_recommendation_reasoning_batch(
+            [
+                {
+                    "name": product.name,
+                    "type": product.product_type.value,
+                    "risk_level": product.risk_level.value,
+                    "expected_return": product.expected_return,
+                    "min_investment": product.min_investment
+                }
+                for product, _ in matched
+            ],
+            user_profile
+        )
         
-        # Sort by match score
-        recommendations.sort(key=lambda x: x.match_score, reverse=True)
-        return recommendations[:limit]
+        return [
+            ProductRecommendation(
+                product=product,
+                match_score=float(scores[i]),
+                reasoning=reasoning,
+                suitability_factors=self._get_suitability_factors(
+                    product, user_profile, goal_horizon_months,
+                    risk_match=bool(scored.risk_match[i]),
+                    affordable_minimum=bool(scored.affordable_minimum[i])
+                ),
+                recommended_investment=self._calculate_recommended_investment(product, limits)
+            )
+            for (product, i), reasoning in zip(matched, reasonings)
+        ]
     
-    def _calculate_match_score(self, product: Product, user_profile: Dict, goal_horizon_months: Optional[float]) -> float:
-        """Calculate match score between product and user"""
-        score = 0.5  # Base score
+    def _user_risk_ordinal(self, user_profile: Dict) -> int:
+        """Risk ordinal for the user's tolerance, defaulting to moderate"""
+        return _USER_RISK_ORDINALS.get(
+            user_profile.get("risk_tolerance") or "moderate",
+            RISK_ORDINALS[RiskLevel.MEDIUM]
+        )
+    
+    def _get_catalog(self, db: Session) -> _Catalog:
+        """Scoring arrays for all products, reloaded only when the catalog changes"""
+        now = time.monotonic()
+        if _catalog_cache["catalog"] is not None and now < _catalog_cache["expires"]:
+            return _catalog_cache["catalog"]
         
-        # Risk tolerance matching
-        risk_mapping = {
-            "conservative": RiskLevel.LOW,
-            "moderate": RiskLevel.MEDIUM,
-            "aggressive": RiskLevel.HIGH
-        }
+        version = tuple(db.query(
+            func.count(Product.id),
+            func.max(func.coalesce(Product.updated_at, Product.created_at))
+        ).one())
+        if _catalog_cache["catalog"] is None or version != _catalog_cache["version"]:
+            rows = db.query(
+                Product.id, Product.risk_level, Product.product_type,
+                Product.min_investment, Product.annual_fee, Product.rewards_type
+            ).order_by(Product.id).all()
+            _catalog_cache["catalog"] = _Catalog(
+                ids=np.array([r.id for r in rows], dtype=np.int64),
+                risk=np.array([RISK_ORDINALS[r.risk_level] for r in rows], dtype=np.int16),
+                types=np.array([_TYPE_CODES[r.product_type] for r in rows], dtype=np.int8),
+                min_investment=np.array([np.nan if r.min_investment is None else r.min_investment for r in rows], dtype=float),
+                annual_fee=np.array([np.nan if r.annual_fee is None else r.annual_fee for r in rows], dtype=float),
+                has_rewards=np.array([bool(r.rewards_type) for r in rows], dtype=bool)
+            )
+            _catalog_cache["version"] = version
+        _catalog_cache["expires"] = now + _CATALOG_TTL
+        return _catalog_cache["catalog"]
+    
+    def _score_products(
+        self,
+        catalog: _Catalog,
+        user_profile: Dict,
+        limits: Optional[_IncomeLimits],
+        goal_horizon_months: Optional[float]
+    ) -> _Scores:
+        """Calculate match scores between the user and every product in one vectorized pass"""
+        scores = np.full(len(catalog.ids), 0.5)  # Base score
+        types = catalog.types
+        min_inv = catalog.min_investment
+        fee = catalog.annual_fee
         
-        user_risk = risk_mapping.get(user_profile.get("risk_tolerance", "moderate"))
-        if product.risk_level == user_risk:
-            score += 0.3
-        elif abs(ord(product.risk_level.value[0]) - ord(user_risk.value[0])) == 1:
-            score += 0.15
+        # Risk tolerance matching: exact level, or one step away
+        user_ordinal = self._user_risk_ordinal(user_profile)
+        risk_distance = np.abs(catalog.risk - user_ordinal)
+        risk_match = risk_distance == 0
+        scores += np.where(risk_match, 0.3, np.where(risk_distance == 1, 0.15, 0.0))
         
-        # Income-based matching
-        if user_profile.get("income"):
-            if product.min_investment and product.min_investment <= user_profile["income"] * 0.1:
-                score += 0.1
-            elif not product.min_investment:
-                score += 0.1
+        # Income-based matching (no or zero minimum counts as affordable)
+        has_minimum = ~np.isnan(min_inv) & (min_inv != 0)
+        if limits:
+            affordable_minimum = has_minimum & (min_inv <= limits.max_minimum)
+            scores += np.where(~has_minimum | affordable_minimum, 0.1, 0.0)
+        else:
+            affordable_minimum = np.zeros(len(scores), dtype=bool)
         
         # Age-based matching
         age = user_profile.get("age", 30)
-        if age < 30 and product.product_type in [ProductType.MUTUAL_FUND, ProductType.SIP]:
-            score += 0.1
-        elif age > 50 and product.product_type in [ProductType.FD, ProductType.PPF]:
-            score += 0.1
+        if age is not None and age < 30:
+            scores += np.where(np.isin(types, _YOUTH_TYPES), 0.1, 0.0)
+        elif age is not None and age > 50:
+            scores += np.where(np.isin(types, _SENIOR_TYPES), 0.1, 0.0)
 
         # Goal horizon bias
         if goal_horizon_months:
-            if goal_horizon_months <= 12:
-                if product.product_type in [ProductType.FD, ProductType.RD, ProductType.CREDIT_CARD]:
-                    score += 0.1
-            else:
-                if product.product_type in [ProductType.MUTUAL_FUND, ProductType.SIP, ProductType.INSURANCE, ProductType.PPF]:
-                    score += 0.1
+            horizon_types = _SHORT_HORIZON_TYPES if goal_horizon_months <= 12 else _LONG_HORIZON_TYPES
+            scores += np.where(np.isin(types, horizon_types), 0.1, 0.0)
 
         # Credit card suitability
-        if product.product_type == ProductType.CREDIT_CARD:
-            if user_profile.get("income") and product.annual_fee and product.annual_fee < user_profile["income"] * 0.02:
-                score += 0.05
-            if product.rewards_type:
-                score += 0.05
+        is_card = types == _TYPE_CODES[ProductType.CREDIT_CARD]
+        if limits:
+            cheap_fee = ~np.isnan(fee) & (fee != 0) & (fee < limits.max_card_fee)
+            scores += np.where(is_card & cheap_fee, 0.05, 0.0)
+        scores += np.where(is_card & catalog.has_rewards, 0.05, 0.0)
         
-        return min(score, 1.0)
+        return _Scores(np.minimum(scores, 1.0), risk_match, affordable_minimum)
     
-    def _get_suitability_factors(self, product: Product, user_profile: Dict, goal_horizon_months: Optional[float]) -> List[str]:
-        """Get suitability factors for a product"""
+    def _get_suitability_factors(
+        self,
+        product: Product,
+        user_profile: Dict,
+        goal_horizon_months: Optional[float],
+        risk_match: bool,
+        affordable_minimum: bool
+    ) -> List[str]:
+        """Get suitability factors for a product, reusing the scorer's risk and affordability results"""
         factors = []
         
-        risk_mapping = {
-            "conservative": "low risk",
-            "moderate": "moderate risk",
-            "aggressive": "high risk"
-        }
-        
-        user_risk = user_profile.get("risk_tolerance", "moderate")
-        if product.risk_level.value == risk_mapping.get(user_risk, "moderate risk"):
+        if risk_match:
+            user_risk = user_profile.get("risk_tolerance") or "moderate"
             factors.append(f"Matches your {user_risk} risk tolerance")
         
         if product.expected_return:
             factors.append(f"Expected return: {product.expected_return}% annually")
         
-        if product.min_investment and user_profile.get("income"):
-            if product.min_investment <= user_profile["income"] * 0.1:
-                factors.append("Affordable minimum investment")
+        if affordable_minimum:
+            factors.append("Affordable minimum investment")
 
         if goal_horizon_months:
             horizon_label = "short-term" if goal_horizon_months <= 12 else "long-term"
@@ -169,15 +315,18 @@ class RecommendationService:
     def _calculate_recommended_investment(
         self, 
         product: Product, 
-        user_profile: Dict
+        limits: Optional[_IncomeLimits]
     ) -> Optional[float]:
         """Calculate recommended investment amount"""
-        income = user_profile.get("income")
-        if not income:
+        if not limits:
             return None
         
         # Recommend 10-20% of monthly income for investments
         if product.min_investment:
-            return max(product.min_investment, income * 0.1)
-        return income * 0.15
+            return max(product.min_investment, limits.max_minimum)
+        return limits.default_investment
+
 
+@lru_cache(maxsize=1)
+def get_recommendation_service() -> RecommendationService:
+    return RecommendationService()
@@ -2,24 +2,38 @@
 FastAPI Main Application
 AI-Driven Financial Assistant Backend
 """
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.responses import Response
 from contextlib import asynccontextmanager
-import os
+import asyncio
 from dotenv import load_dotenv
 
 from app.database import engine, Base
-from app.routers import goals, budgeting, recommendations, alerts, auth, chat
-from app.core.config import settings
+from app.core.config import get_settings
+from app.core.orjson_response import ORJSONResponse
 
 load_dotenv()
 
-# Create database tables
+def include_routers(app: FastAPI) -> None:
+    """Import and mount API routers; called exactly once, when this module is imported"""
+    from app.routers import goals, budgeting, recommendations, alerts, auth, chat
+
+    app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
+    app.include_router(goals.router, prefix="/api/v1/goals", tags=["Goals"])
+    app.include_router(budgeting.router, prefix="/api/v1/budgeting", tags=["Budgeting"])
+    app.include_router(recommendations.router, prefix="/api/v1/recommendations", tags=["Recommendations"])
+    app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["Alerts"])
+    app.include_router(chat.router, prefix="/api/v1/chat", tags=["Chat"])
+
+# Create database tables (development only; production schema is managed separately)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
-    Base.metadata.create_all(bind=engine)
+    # Startup (models are registered by the routers mounted at import time)
+    from app.services.ai_service import load_tokenizer
+    await asyncio.to_thread(load_tokenizer)
+    if get_settings().DEBUG:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
     yield
     # Shutdown
     pass
@@ -28,26 +42,21 @@ app = FastAPI(
     title="AI Financial Assistant API",
     description="AI-driven financial assistant with goal planning, budgeting, and recommendations",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
+include_routers(app)
 
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:3000", "http://localhost:8501"],  # Next.js and Streamlit
     allow_credentials=True,
-    allow_methods=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE"],
     allow_headers=["*"],
+    max_age=86400,  # Let browsers cache preflight responses for 24h
 )
 
-# Include routers
-app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
-app.include_router(goals.router, prefix="/api/v1/goals", tags=["Goals"])
-app.include_router(budgeting.router, prefix="/api/v1/budgeting", tags=["Budgeting"])
-app.include_router(recommendations.router, prefix="/api/v1/recommendations", tags=["Recommendations"])
-app.include_router(alerts.router, prefix="/api/v1/alerts", tags=["Alerts"])
-app.include_router(chat.router, prefix="/api/v1/chat", tags=["Chat"])
-
 @app.get("/")
 async def root():
     return {
@@ -56,9 +65,12 @@ async def root():
         "docs": "/docs"
     }
 
+# Liveness probes hit this constantly; serve pre-encoded bytes
+_HEALTH_RESPONSE = Response(content=b'{"status":"healthy"}', media_type="application/json")
+
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return _HEALTH_RESPONSE
 
 if __name__ == "__main__":
     import uvicorn
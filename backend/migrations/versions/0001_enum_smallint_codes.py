@@ -0,0 +1,83 @@
+"""Store enum columns as SMALLINT codes
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-15
+
+The original schema stored enum member names ('RETIREMENT', 'HIGH', ...): a native
+ENUM type per column on PostgreSQL, VARCHAR elsewhere. Rewrite each value as the
+code from the model's *_CODES map.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.alert import ALERT_PRIORITY_CODES, ALERT_TYPE_CODES
+from app.models.goal import GOAL_STATUS_CODES, GOAL_TYPE_CODES
+from app.models.obligation import OBLIGATION_FREQUENCY_CODES, OBLIGATION_STATUS_CODES, OBLIGATION_TYPE_CODES
+from app.models.product import PRODUCT_TYPE_CODES, RISK_LEVEL_CODES
+from app.models.transaction import TRANSACTION_CATEGORY_CODES, TRANSACTION_TYPE_CODES
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# (table, column, PostgreSQL enum type created by the original schema, codes)
+ENUM_COLUMNS = [
+    ("goals", "goal_type", "goaltype", GOAL_TYPE_CODES),
+    ("goals", "status", "goalstatus", GOAL_STATUS_CODES),
+    ("products", "product_type", "producttype", PRODUCT_TYPE_CODES),
+    ("products", "risk_level", "risklevel", RISK_LEVEL_CODES),
+    ("transactions", "transaction_type", "transactiontype", TRANSACTION_TYPE_CODES),
+    ("transactions", "category", "transactioncategory", TRANSACTION_CATEGORY_CODES),
+    ("obligations", "obligation_type", "obligationtype", OBLIGATION_TYPE_CODES),
+    ("obligations", "frequency", "obligationfrequency", OBLIGATION_FREQUENCY_CODES),
+    ("obligations", "status", "obligationstatus", OBLIGATION_STATUS_CODES),
+    ("alerts", "alert_type", "alerttype", ALERT_TYPE_CODES),
+    ("alerts", "priority", "alertpriority", ALERT_PRIORITY_CODES),
+]
+
+
+def _name_to_code(expr, codes):
+    whens = " ".join(f"WHEN '{member.name}' THEN {code}" for member, code in codes.items())
+    return f"CASE {expr} {whens} END"
+
+
+def _code_to_name(expr, codes):
+    whens = " ".join(f"WHEN {code} THEN '{member.name}'" for member, code in codes.items())
+    return f"CASE {expr} {whens} END"
+
+
+def upgrade():
+    postgres = op.get_bind().dialect.name == "postgresql"
+    for table, column, enum_name, codes in ENUM_COLUMNS:
+        if postgres:
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE SMALLINT "
+                f"USING {_name_to_code(f'{column}::text', codes)}"
+            )
+        else:
+            # VARCHAR storage: rewrite names in place, then let batch mode rebuild the
+            # table with a SMALLINT column (the copy casts '3' -> 3)
+            op.execute(f"UPDATE {table} SET {column} = {_name_to_code(column, codes)}")
+            with op.batch_alter_table(table) as batch:
+                batch.alter_column(column, type_=sa.SmallInteger(), existing_type=sa.String())
+    if postgres:
+        for _, _, enum_name, _ in ENUM_COLUMNS:
+            op.execute(f"DROP TYPE IF EXISTS {enum_name}")
+
+
+def downgrade():
+    postgres = op.get_bind().dialect.name == "postgresql"
+    for table, column, enum_name, codes in ENUM_COLUMNS:
+        if postgres:
+            names = ", ".join(f"'{member.name}'" for member in codes)
+            op.execute(f"CREATE TYPE {enum_name} AS ENUM ({names})")
+            op.execute(
+                f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+                f"USING ({_code_to_name(column, codes)})::{enum_name}"
+            )
+        else:
+            with op.batch_alter_table(table) as batch:
+                batch.alter_column(column, type_=sa.String(), existing_type=sa.SmallInteger())
+            op.execute(f"UPDATE {table} SET {column} = {_code_to_name(f'CAST({column} AS INTEGER)', codes)}")
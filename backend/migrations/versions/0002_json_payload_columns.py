@@ -0,0 +1,69 @@
+"""Store JSON payload columns as JSON/JSONB
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+
+These columns used to hold JSON as text. Not every stored value is valid JSON:
+goals.ai_plan was written with str(dict), and empty strings occur. Normalise
+each value to JSON text first, then switch the column type on PostgreSQL
+(other dialects keep the text storage that the generic JSON type reads).
+"""
+import ast
+import json
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+JSON_COLUMNS = [
+    ("goals", "ai_plan"),
+    ("products", "features"),
+    ("products", "eligibility_criteria"),
+    ("obligations", "extra_metadata"),
+    ("alerts", "alert_metadata"),
+]
+
+
+def _as_json_text(value):
+    """Valid JSON text for a stored value, or None for blanks"""
+    if value is None or not value.strip():
+        return None
+    try:
+        json.loads(value)
+        return value
+    except ValueError:
+        pass
+    try:
+        # Python repr of a dict/list, as the old goal service stored it
+        return json.dumps(ast.literal_eval(value))
+    except (ValueError, SyntaxError, TypeError):
+        # Keep anything else as a JSON string rather than dropping it
+        return json.dumps(value)
+
+
+def upgrade():
+    bind = op.get_bind()
+    for table, column in JSON_COLUMNS:
+        rows = bind.execute(sa.text(f"SELECT id, {column} FROM {table} WHERE {column} IS NOT NULL")).all()
+        fixed = []
+        for row_id, value in rows:
+            normalized = _as_json_text(value)
+            if normalized != value:
+                fixed.append({"id": row_id, "value": normalized})
+        if fixed:
+            bind.execute(sa.text(f"UPDATE {table} SET {column} = :value WHERE id = :id"), fixed)
+        if bind.dialect.name == "postgresql":
+            op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE JSONB USING {column}::jsonb")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for table, column in JSON_COLUMNS:
+        text_type = "TEXT" if table == "products" else "VARCHAR"
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {text_type} USING {column}::text")
@@ -0,0 +1,54 @@
+"""Add alert entity columns for dedup lookups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+
+Alert dedup matches on (user_id, alert_type, entity_id, is_read). Existing goal and
+obligation alerts only carry the id inside alert_metadata, so copy it into the new
+columns; otherwise every open goal/obligation would be alerted again.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.models.alert import ALERT_TYPE_CODES, AlertType
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+# entity_type -> (metadata key holding its id, alert types raised for it)
+ENTITY_ALERTS = {
+    "goal": ("goal_id", [AlertType.GOAL_DEADLINE]),
+    "obligation": ("obligation_id", [AlertType.DUE_SOON, AlertType.PAST_DUE]),
+}
+
+
+def upgrade():
+    with op.batch_alter_table("alerts") as batch:
+        batch.add_column(sa.Column("entity_type", sa.String(32), nullable=True))
+        batch.add_column(sa.Column("entity_id", sa.Integer(), nullable=True))
+
+    postgres = op.get_bind().dialect.name == "postgresql"
+    for entity_type, (key, alert_types) in ENTITY_ALERTS.items():
+        if postgres:
+            id_expr = f"(alert_metadata->>'{key}')::integer"
+        else:
+            id_expr = f"CAST(json_extract(alert_metadata, '$.{key}') AS INTEGER)"
+        codes = ", ".join(str(ALERT_TYPE_CODES[alert_type]) for alert_type in alert_types)
+        op.execute(
+            f"UPDATE alerts SET entity_type = '{entity_type}', entity_id = {id_expr} "
+            f"WHERE alert_type IN ({codes}) AND {id_expr} IS NOT NULL"
+        )
+
+    op.create_index(
+        "ix_alerts_user_type_entity", "alerts", ["user_id", "alert_type", "entity_id", "is_read"]
+    )
+
+
+def downgrade():
+    op.drop_index("ix_alerts_user_type_entity", table_name="alerts")
+    with op.batch_alter_table("alerts") as batch:
+        batch.drop_column("entity_id")
+        batch.drop_column("entity_type")
@@ -0,0 +1,96 @@
+"""
+Shared fixtures: a throwaway SQLite database and an authenticated test client
+"""
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+_DB_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_DB_PATH}")
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("DEBUG", "false")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import Depends
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.main import app
+from app.database import Base, SessionLocal, engine, get_db
+from app.core.security import get_current_user
+from app.models.user import User
+from app.models.goal import Goal, GoalType
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema():
+    Base.metadata.create_all(bind=engine)
+    yield
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture(autouse=True)
+def _clean_tables():
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="user@example.com",
+        username="user",
+        hashed_password="x",
+        age=32,
+        income=60000,
+        risk_tolerance="moderate"
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client(user):
+    user_id = user.id
+
+    def current_user(db: Session = Depends(get_db)) -> User:
+        return db.get(User, user_id)
+
+    app.dependency_overrides[get_current_user] = current_user
+    try:
+        yield TestClient(app)
+    finally:
+        app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def make_goal(db, user):
+    def _make_goal(**overrides) -> Goal:
+        values = {
+            "user_id": user.id,
+            "title": "House deposit",
+            "goal_type": GoalType.HOUSE,
+            "target_amount": 50000.0,
+            "target_date": datetime.now(timezone.utc) + timedelta(days=365),
+        }
+        values.update(overrides)
+        goal = Goal(**values)
+        db.add(goal)
+        db.commit()
+        return goal
+    return _make_goal
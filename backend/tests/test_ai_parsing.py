@@ -0,0 +1,122 @@
+"""
+Parsing of batched LLM replies in AIService
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import ai_service
+from app.services.ai_service import AIService
+
+
+class FakeLLM:
+    """Returns canned replies in order and records every prompt it receives"""
+
+    def __init__(self, *replies: str):
+        self.replies = list(replies)
+        self.calls = []
+
+    async def ainvoke(self, messages):
+        self.calls.append(messages)
+        return SimpleNamespace(content=self.replies.pop(0))
+
+
+def _fenced(payload) -> str:
+    return f"```json\n{json.dumps(payload)}\n```"
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(ai_service, "_encoding", lambda: None)
+    ai_service._reasoning_cache.clear()
+    yield AIService()
+    ai_service._reasoning_cache.clear()
+
+
+def _use_llm(service: AIService, llm: FakeLLM) -> FakeLLM:
+    service.__dict__["deterministic_llm"] = llm
+    return llm
+
+
+WINDOWS = [
+    {"id": 0, "transactions": [{"amount": 120.0, "type": "expense", "category": "food", "date": "2024-01-03T10:00:00"}]},
+    {"id": 1, "transactions": [{"amount": 80.0, "type": "expense", "category": "transport", "date": "2024-02-05T10:00:00"}]},
+]
+
+
+def test_spending_batch_parses_fenced_reply(service):
+    _use_llm(service, FakeLLM(_fenced([
+        {"id": 1, "insights": "second"},
+        {"id": 0, "insights": "first"},
+    ])))
+
+    results = asyncio.run(service.analyze_spending_batch(WINDOWS))
+
+    assert [r["insights"] for r in results] == ["first", "second"]
+
+
+def test_spending_batch_falls_back_to_raw_text_on_malformed_reply(service):
+    _use_llm(service, FakeLLM("Spending looks fine."))
+
+    results = asyncio.run(service.analyze_spending_batch(WINDOWS))
+
+    assert results == [{"insights": "Spending looks fine.", "recommendations": []}] * 2
+
+
+def test_spending_batch_with_no_windows_makes_no_call(service):
+    llm = _use_llm(service, FakeLLM())
+
+    assert asyncio.run(service.analyze_spending_batch([])) == []
+    assert llm.calls == []
+
+
+PRODUCTS = [{"name": f"Fund {i}", "type": "mutual_fund"} for i in range(3)]
+PROFILE = {"age": 34, "income": 52000, "risk_tolerance": "moderate"}
+
+
+def test_reasoning_batch_parses_fenced_reply_in_one_call(service):
+    llm = _use_llm(service, FakeLLM(_fenced([
+        {"id": i, "reasoning": f"because {i}"} for i in range(3)
+    ])))
+
+    results = asyncio.run(service.generate_recommendation_reasoning_batch(PRODUCTS, PROFILE))
+
+    assert results == ["because 0", "because 1", "because 2"]
+    assert len(llm.calls) == 1
+
+
+def test_reasoning_batch_explains_missing_products_individually(service):
+    llm = _use_llm(service, FakeLLM(
+        _fenced([{"id": 0, "reasoning": "batched"}]),
+        "single answer",
+        "single answer",
+    ))
+
+    results = asyncio.run(service.generate_recommendation_reasoning_batch(PRODUCTS, PROFILE))
+
+    assert results == ["batched", "single answer", "single answer"]
+    assert len(llm.calls) == 3
+
+
+def test_reasoning_batch_never_returns_or_caches_malformed_payload(service):
+    malformed = "[{\"id\": 0, \"reasoning\": "
+    _use_llm(service, FakeLLM(malformed, "one", "two", "three"))
+
+    results = asyncio.run(service.generate_recommendation_reasoning_batch(PRODUCTS, PROFILE))
+
+    assert malformed not in results
+    assert sorted(results) == ["one", "three", "two"]
+    assert malformed not in ai_service._reasoning_cache.values()
+
+
+def test_reasoning_batch_uses_cache_without_calling_the_model(service):
+    _use_llm(service, FakeLLM(_fenced([{"id": i, "reasoning": f"r{i}"} for i in range(3)])))
+    asyncio.run(service.generate_recommendation_reasoning_batch(PRODUCTS, PROFILE))
+
+    llm = _use_llm(service, FakeLLM())
+    results = asyncio.run(service.generate_recommendation_reasoning_batch(PRODUCTS, PROFILE))
+
+    assert results == ["r0", "r1", "r2"]
+    assert llm.calls == []
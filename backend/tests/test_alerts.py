@@ -0,0 +1,31 @@
+"""
+Alert checks against timestamps read back from the database
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.models.alert import AlertType
+from app.models.obligation import Obligation
+from app.services.alert_service import AlertService
+
+
+def test_goal_deadline_alert_from_stored_target_date(db, user, make_goal):
+    goal = make_goal(target_date=datetime.now(timezone.utc) + timedelta(days=10))
+
+    alerts = AlertService().check_goal_deadlines(db, user.id)
+
+    assert [(a.alert_type, a.entity_id) for a in alerts] == [(AlertType.GOAL_DEADLINE, goal.id)]
+
+
+def test_obligation_due_alerts_from_stored_due_dates(db, user):
+    now = datetime.now(timezone.utc)
+    soon = Obligation(user_id=user.id, title="Rent", amount=900.0, due_date=now + timedelta(days=2))
+    late = Obligation(user_id=user.id, title="Card bill", amount=150.0, due_date=now - timedelta(days=3))
+    db.add_all([soon, late])
+    db.commit()
+
+    alerts = AlertService().check_obligations_due(db, user.id)
+
+    assert {(a.alert_type, a.entity_id) for a in alerts} == {
+        (AlertType.DUE_SOON, soon.id),
+        (AlertType.PAST_DUE, late.id),
+    }
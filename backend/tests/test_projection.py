@@ -0,0 +1,28 @@
+"""
+Sparse field projection on list endpoints (?fields=...)
+"""
+
+
+def test_unknown_field_is_rejected(client, make_goal):
+    make_goal()
+
+    response = client.get("/api/v1/goals", params={"fields": "id,bogus"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: bogus"
+
+
+def test_projection_returns_only_requested_fields(client, make_goal):
+    goal = make_goal(title="Car")
+
+    items = client.get("/api/v1/goals", params={"fields": "id,title"}).json()
+
+    assert items == [{"id": goal.id, "title": "Car"}]
+
+
+def test_projection_keeps_null_fields(client, make_goal):
+    goal = make_goal(description=None)
+
+    items = client.get("/api/v1/goals", params={"fields": "id,description"}).json()
+
+    assert items == [{"id": goal.id, "description": None}]
@@ -0,0 +1,113 @@
+"""
+Ranking parity between the vectorized scorer and the per-product rules it replaced
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.product import Product, ProductType, RiskLevel
+from app.services.recommendation_service import RecommendationService
+
+# (type, risk, min_investment, annual_fee, rewards_type)
+CATALOG = [
+    (ProductType.MUTUAL_FUND, RiskLevel.MEDIUM, 5000.0, None, None),
+    (ProductType.SIP, RiskLevel.HIGH, 500.0, None, None),
+    (ProductType.FD, RiskLevel.LOW, 10000.0, None, None),
+    (ProductType.RD, RiskLevel.LOW, 0.0, None, None),
+    (ProductType.STOCK, RiskLevel.HIGH, None, None, None),
+    (ProductType.BOND, RiskLevel.MEDIUM, 25000.0, None, None),
+    (ProductType.INSURANCE, RiskLevel.LOW, 1000.0, None, None),
+    (ProductType.PPF, RiskLevel.LOW, 500.0, None, None),
+    (ProductType.CREDIT_CARD, RiskLevel.MEDIUM, None, 500.0, "cashback"),
+    (ProductType.CREDIT_CARD, RiskLevel.MEDIUM, None, 0.0, None),
+    (ProductType.CREDIT_CARD, RiskLevel.HIGH, None, 5000.0, "travel"),
+    (ProductType.MUTUAL_FUND, RiskLevel.MEDIUM, 5000.0, None, None),
+]
+
+RISK_STEPS = {RiskLevel.LOW: 0, RiskLevel.MEDIUM: 1, RiskLevel.HIGH: 2}
+USER_RISK = {"conservative": RiskLevel.LOW, "moderate": RiskLevel.MEDIUM, "aggressive": RiskLevel.HIGH}
+
+
+def reference_score(product, profile, horizon_months):
+    """The original one-product-at-a-time rules, with risk steps measured low < medium < high"""
+    score = 0.5
+    income = profile["income"]
+    user_risk = USER_RISK[profile["risk_tolerance"] or "moderate"]
+    distance = abs(RISK_STEPS[product.risk_level] - RISK_STEPS[user_risk])
+    if distance == 0:
+        score += 0.3
+    elif distance == 1:
+        score += 0.15
+    if income:
+        if not product.min_investment or product.min_investment <= income * 0.1:
+            score += 0.1
+    age = profile["age"]
+    if age is not None and age < 30 and product.product_type in (ProductType.MUTUAL_FUND, ProductType.SIP):
+        score += 0.1
+    elif age is not None and age > 50 and product.product_type in (ProductType.FD, ProductType.PPF):
+        score += 0.1
+    if horizon_months:
+        if horizon_months <= 12:
+            if product.product_type in (ProductType.FD, ProductType.RD, ProductType.CREDIT_CARD):
+                score += 0.1
+        elif product.product_type in (ProductType.MUTUAL_FUND, ProductType.SIP, ProductType.INSURANCE, ProductType.PPF):
+            score += 0.1
+    if product.product_type == ProductType.CREDIT_CARD:
+        if income and product.annual_fee and product.annual_fee < income * 0.02:
+            score += 0.05
+        if product.rewards_type:
+            score += 0.05
+    return min(score, 1.0)
+
+
+class NoReasoning:
+    async def generate_recommendation_reasoning_batch(self, products, user_profile):
+        return ["" for _ in products]
+
+
+@pytest.fixture
+def products(db):
+    rows = [
+        Product(
+            name=f"Product {n}", product_type=product_type, risk_level=risk,
+            min_investment=min_investment, annual_fee=fee, rewards_type=rewards
+        )
+        for n, (product_type, risk, min_investment, fee, rewards) in enumerate(CATALOG)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return sorted(rows, key=lambda p: p.id)
+
+
+@pytest.mark.parametrize("age, income, risk_tolerance, horizon_days, horizon_months", [
+    (25, 60000.0, "moderate", None, None),
+    (40, 60000.0, "conservative", 180, 6),
+    (60, 8000.0, "aggressive", 1095, 36),
+    (35, None, None, None, None),
+    (None, 120000.0, "aggressive", 180, 6),
+])
+def test_ranking_matches_reference_scorer(
+    db, user, products, make_goal, age, income, risk_tolerance, horizon_days, horizon_months
+):
+    user.age, user.income, user.risk_tolerance = age, income, risk_tolerance
+    db.commit()
+    goal_id = None
+    if horizon_days:
+        goal_id = make_goal(target_date=datetime.now(timezone.utc) + timedelta(days=horizon_days)).id
+    profile = {"age": age, "income": income, "risk_tolerance": risk_tolerance}
+
+    expected = sorted(
+        ((p.id, reference_score(p, profile, horizon_months)) for p in products),
+        key=lambda item: -item[1]
+    )
+    expected = [(product_id, score) for product_id, score in expected if score > 0.5]
+
+    service = RecommendationService()
+    service.ai_service = NoReasoning()
+    recommendations = asyncio.run(
+        service.get_recommendations(db, user.id, goal_id=goal_id, limit=len(CATALOG))
+    )
+
+    assert [r.product.id for r in recommendations] == [product_id for product_id, _ in expected]
+    assert [r.match_score for r in recommendations] == pytest.approx([score for _, score in expected])
@@ -0,0 +1,24 @@
+"""
+List endpoints must serialize rows exactly like the detail endpoints
+"""
+
+
+def test_goal_list_item_matches_detail(client, make_goal):
+    goal = make_goal(description="Two-bed flat")
+
+    listed = client.get("/api/v1/goals").json()
+    detail = client.get(f"/api/v1/goals/{goal.id}").json()
+
+    assert len(listed) == 1
+    detail.pop("ai_plan")
+    assert listed[0] == detail
+
+
+def test_null_fields_are_kept_in_list_payloads(client, make_goal):
+    make_goal(description=None, monthly_contribution=None)
+
+    item = client.get("/api/v1/goals").json()[0]
+
+    assert item["description"] is None
+    assert item["monthly_contribution"] is None
+    assert item["updated_at"] is None
@@ -5,6 +5,8 @@ import streamlit as st
 import openai
 import requests
 import os
+import threading
+from concurrent.futures import Future
 from dotenv import load_dotenv
 import json
 from datetime import datetime
@@ -19,8 +21,16 @@ st.set_page_config(
 )
 
 # Initialize OpenAI
-openai.api_key = os.getenv("OPENAI_API_KEY")
+@st.cache_resource
+def openai_client():
+    """One OpenAI client (and connection pool) shared across reruns and sessions"""
+    return openai.OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
+DEFAULT_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+MODEL_OPTIONS = list(dict.fromkeys([DEFAULT_MODEL, "gpt-4o-mini", "gpt-3.5-turbo", "gpt-4o", "gpt-4-turbo"]))
+MAX_HISTORY = 10  # turns sent to the model
+MAX_TRANSCRIPT = 500  # turns kept on screen
 
 # Initialize session state
 if "messages" not in st.session_state:
@@ -32,11 +42,16 @@ if "user_context" not in st.session_state:
         "risk_tolerance": "moderate"
     }
 
-def chat_with_ai(message, context=None):
-    """Chat with OpenAI directly for demo"""
+def current_model():
+    """Model picked in the sidebar, falling back to OPENAI_MODEL"""
+    return st.session_state.get("model", DEFAULT_MODEL)
+
+def chat_with_ai(message, context=None, placeholder=None, history=None):
+    """Chat with OpenAI directly for demo, streaming tokens into placeholder if given.
+    The last MAX_HISTORY turns of history are sent so the model sees the conversation."""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        stream = openai_client().chat.completions.create(
+            model=current_model(),
             messages=[
                 {
                     "role": "system",
@@ -46,24 +61,29 @@ def chat_with_ai(message, context=None):
                     - Goal-based investment planning
                     - Budgeting and spending analysis
                     - Financial product recommendations
-                    - Risk assessment"""
+                    - Risk assessment""" + f"\n\nUser Context: {json.dumps(context or {})}"
                 },
-                {
-                    "role": "user",
-                    "content": f"User Context: {json.dumps(context or {})}\n\nUser Message: {message}"
-                }
+                *(history or [])[-MAX_HISTORY:],
+                {"role": "user", "content": message}
             ],
-            temperature=0.7
+            temperature=0.7,
+            stream=True
         )
-        return response.choices[0].message.content
+        response = ""
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                response += chunk.choices[0].delta.content
+                if placeholder is not None:
+                    placeholder.markdown(response + "▌")
+        return response
     except Exception as e:
         return f"Error: {str(e)}"
 
 def analyze_goal(user_input, context):
     """Analyze and extract financial goals"""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = openai_client().chat.completions.create(
+            model=current_model(),
             messages=[
                 {
                     "role": "system",
@@ -76,7 +96,8 @@ def analyze_goal(user_input, context):
                     "content": f"User Input: {user_input}\nUser Context: {json.dumps(context)}\n\nExtract the financial goal and create a detailed plan."
                 }
             ],
-            temperature=0.7
+            temperature=0.7,
+            response_format={"type": "json_object"}
         )
         return response.choices[0].message.content
     except Exception as e:
@@ -85,8 +106,8 @@ def analyze_goal(user_input, context):
 def get_recommendations(context):
     """Get product recommendations with reasoning"""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-4",
+        response = openai_client().chat.completions.create(
+            model=current_model(),
             messages=[
                 {
                     "role": "system",
@@ -104,6 +125,68 @@ def get_recommendations(context):
     except Exception as e:
         return f"Error: {str(e)}"
 
+@st.cache_resource
+def _inflight():
+    """Calls currently running, shared by all sessions and reruns"""
+    return {}, threading.Lock()
+
+def coalesced(key, fn):
+    """Run fn once per key at a time; concurrent callers wait for the same result"""
+    registry, lock = _inflight()
+    with lock:
+        future = registry.get(key)
+        owner = future is None
+        if owner:
+            future = registry[key] = Future()
+    if not owner:
+        return future.result()
+    try:
+        result = fn()
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with lock:
+            registry.pop(key, None)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def cached_recommendations(age, income, risk_tolerance, model):
+    """Recommendations for a profile and model, reused for five minutes"""
+    context = {"age": age, "income": income, "risk_tolerance": risk_tolerance}
+    recommendations = coalesced(
+        ("recommendations", age, income, risk_tolerance, model),
+        lambda: get_recommendations(context)
+    )
+    if recommendations.startswith("Error:"):
+        # Exceptions are not cached, so a failed call is retried next time
+        raise RuntimeError(recommendations)
+    return recommendations
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_goal_analysis(goal_input, age, income, risk_tolerance, model):
+    """Goal plan for a description, profile and model; re-analyzing the same goal is free"""
+    context = {"age": age, "income": income, "risk_tolerance": risk_tolerance}
+    plan = analyze_goal(goal_input, context)
+    if plan.startswith("Error:"):
+        raise RuntimeError(plan)
+    return plan
+
+@st.cache_data(show_spinner=False)
+def build_insights(age, income):
+    """Quick Insights text, recomputed only when the profile changes"""
+    return """
+    **Based on your profile:**
+    - Recommended emergency fund: ${:,.0f} (6 months expenses)
+    - Suggested monthly savings: ${:,.0f} (20% of income)
+    - Investment horizon: {} years until retirement
+    """.format(
+        income * 0.5,
+        income * 0.2 / 12,
+        65 - age
+    )
+
 # Sidebar for user profile
 with st.sidebar:
     st.header("👤 User Profile")
@@ -123,9 +206,16 @@ with st.sidebar:
     
     st.divider()
     
+    st.selectbox("Model", MODEL_OPTIONS, key="model")
+    
+    st.divider()
+    
     if st.button("Get Recommendations"):
         with st.spinner("Analyzing your profile..."):
-            recommendations = get_recommendations(st.session_state.user_context)
+            try:
+                recommendations = cached_recommendations(age, income, risk_tolerance, current_model())
+            except RuntimeError as e:
+                recommendations = str(e)
             st.session_state.messages.append({
                 "role": "assistant",
                 "content": f"**Product Recommendations:**\n\n{recommendations}"
@@ -148,6 +238,7 @@ with tab1:
     
     # Chat input
     if prompt := st.chat_input("Ask me about your finances..."):
+        history = st.session_state.messages[-MAX_HISTORY:]
         # Add user message
         st.session_state.messages.append({"role": "user", "content": prompt})
         with st.chat_message("user"):
@@ -155,10 +246,13 @@ with tab1:
         
         # Get AI response
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                response = chat_with_ai(prompt, st.session_state.user_context)
-                st.markdown(response)
-                st.session_state.messages.append({"role": "assistant", "content": response})
+            # Tokens render as they arrive instead of after the full completion
+            placeholder = st.empty()
+            response = chat_with_ai(prompt, st.session_state.user_context, placeholder, history)
+            placeholder.markdown(response)
+            st.session_state.messages.append({"role": "assistant", "content": response})
+            # Only the last MAX_HISTORY turns go to the model; the transcript keeps far more
+            del st.session_state.messages[:-MAX_TRANSCRIPT]
     
     if st.button("Clear Chat"):
         st.session_state.messages = []
@@ -175,9 +269,15 @@ with tab2:
     if st.button("Analyze Goal"):
         if goal_input:
             with st.spinner("Analyzing your goal..."):
-                plan = analyze_goal(goal_input, st.session_state.user_context)
+                try:
+                    plan = cached_goal_analysis(goal_input.strip(), age, income, risk_tolerance, current_model())
+                except RuntimeError as e:
+                    plan = str(e)
                 st.markdown("### Goal Analysis & Plan")
-                st.markdown(plan)
+                try:
+                    st.json(json.loads(plan))
+                except ValueError:
+                    st.markdown(plan)
         else:
             st.warning("Please enter a goal description")
 
@@ -197,22 +297,16 @@ with tab3:
     st.divider()
     
     st.subheader("Quick Insights")
-    st.info("""
-    **Based on your profile:**
-    - Recommended emergency fund: ${:,.0f} (6 months expenses)
-    - Suggested monthly savings: ${:,.0f} (20% of income)
-    - Investment horizon: {} years until retirement
-    """.format(
-        st.session_state.user_context["income"] * 0.5,
-        st.session_state.user_context["income"] * 0.2 / 12,
-        65 - st.session_state.user_context["age"]
+    st.info(build_insights(
+        st.session_state.user_context["age"],
+        st.session_state.user_context["income"]
     ))
 
 # Footer
 st.divider()
 st.markdown("""
 <div style='text-align: center; color: gray;'>
-    <p>AI Financial Assistant Demo | Powered by GPT-4</p>
+    <p>AI Financial Assistant Demo | Powered by OpenAI</p>
 </div>
 """, unsafe_allow_html=True)
 
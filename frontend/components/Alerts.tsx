@@ -11,7 +11,22 @@ interface Alert {
   priority: string
   is_read: boolean
   created_at: string
-  alert_metadata?: string | null
+  // An object from the API; rows written before the JSON migration may still arrive as a JSON string
+  alert_metadata?: AlertMetadata | string | null
+}
+
+type AlertMetadata = { due_date?: string; [key: string]: unknown }
+
+function dueDateOf(alert: Alert): string | undefined {
+  let meta = alert.alert_metadata
+  if (typeof meta === 'string') {
+    try {
+      meta = JSON.parse(meta) as AlertMetadata
+    } catch (e) {
+      return undefined
+    }
+  }
+  return meta?.due_date
 }
 
 export default function Alerts({ token }: { token: string | null }) {
@@ -267,18 +282,9 @@ export default function Alerts({ token }: { token: string | null }) {
                 <p className="text-xs opacity-75">
                   {new Date(alert.created_at).toLocaleString()}
                 </p>
-                {alert.alert_metadata && (
+                {dueDateOf(alert) && (
                   <p className="text-xs opacity-75 mt-1">
-                    {(() => {
-                      try {
-                        const meta = JSON.parse(alert.alert_metadata)
-                        if (meta.due_date) {
-                          return `Due: ${new Date(meta.due_date).toLocaleDateString()}`
-                        }
-                      } catch (e) {
-                        return null
-                      }
-                    })()}
+                    Due: {new Date(dueDateOf(alert)!).toLocaleDateString()}
                   </p>
                 )}
               </div>